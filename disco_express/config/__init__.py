@@ -1,77 +1,241 @@
 import csv
+import functools
+import io
+import logging
 import os.path
 import shutil
 import sys
 import tomllib
 
-from .models import Config, Song
+from pydantic import BaseModel
+
+from .cache import load_cached
+from .models import Config, LanguageConfig, Song
+from .profanity import ProfanityMatcher
+
+APP_CONFIG_ROOT = os.path.expanduser("~/disco_express")
+CACHE_DIR = os.path.join(APP_CONFIG_ROOT, "cache")
 
 
 def get_application_path() -> str:
     """Return the path of the application."""
     if getattr(sys, "frozen", False):
         return sys._MEIPASS  # noqa: SLF001
-    return os.path.abspath(os.path.dirname(sys.modules["__main__"].__file__))
-
+    # the project root next to this package, wherever the app was started from
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-APP_CONFIG_ROOT = os.path.expanduser("~/disco_express")
 
-ASSETS = os.path.join(get_application_path(), "assets")
+def get_assets_path() -> str:
+    """Return the path of the assets shipped with the application."""
+    return os.path.join(get_application_path(), "assets")
 
 
 def checkout_files():
     """Check if necessary files are in APP_CONFIG_ROOT and copy them there if not."""
     os.makedirs(APP_CONFIG_ROOT, exist_ok=True)
 
+    assets = get_assets_path()
     dirs_to_checkout = ["img", "data", "icons"]
     for checkout_dir in dirs_to_checkout:
         dst = os.path.join(APP_CONFIG_ROOT, checkout_dir)
         if not os.path.isdir(dst):
-            src = os.path.join(ASSETS, checkout_dir)
+            src = os.path.join(assets, checkout_dir)
             shutil.copytree(src, dst)
 
     config_path = os.path.join(APP_CONFIG_ROOT, "config.toml")
     if not os.path.isfile(config_path):
-        src = os.path.join(ASSETS, "config.toml")
+        src = os.path.join(assets, "config.toml")
         shutil.copy(src, APP_CONFIG_ROOT)
 
 
-checkout_files()
-
-config = os.path.join(APP_CONFIG_ROOT, "config.toml")
-with open(config, "rb") as f:
-    toml = tomllib.load(f)
-    CONFIG = Config(**toml)
+def parse_config(data: bytes) -> Config:
+    """Function to parse and validate the content of a config.toml."""
+    return Config(**tomllib.loads(data.decode()))
 
-slurs_file = os.path.join(APP_CONFIG_ROOT, CONFIG.general.slurs_file)
-with open(slurs_file, "rb") as f:
-    SLURS = f.readlines()
-    SLURS = [slur.decode().replace("\n", "").lower() for slur in SLURS]
 
+def parse_slurs(data: bytes) -> ProfanityMatcher:
+    """Function to compile the content of a slurs file with one slur per line."""
+    return ProfanityMatcher(data.decode().splitlines())
 
-def contains_slur(text: str) -> bool:
-    """Function to check if a text contains a slur."""
-    words = text.lower().split(" ")
 
-    return any(word in SLURS for word in words)
+def parse_songs(data: bytes) -> list[Song]:
+    """Function to parse the content of a "Title;Artist[;Plays]" csv file."""
+    songs = []
+    reader = csv.reader(io.StringIO(data.decode(), newline=""), delimiter=";")
+    next(reader)  # Skip the header
+    for row in reader:
+        song = Song(title=row[0], artist=row[1], plays=0)
+        if len(row) > 2:  # noqa: PLR2004
+            song.plays = row[2]
+        songs.append(song)
+    return songs
 
 
 def load_songs_from_csv(file_path: str) -> list[Song]:
     """Function to load the songs from a csv file."""
-    songs = []
-    with open(file_path, newline="") as file:
-        reader = csv.reader(file, delimiter=";")
-        next(reader)  # Skip the header
-        for row in reader:
-            song = Song(title=row[0], artist=row[1], plays=0)
-            if len(row) > 2:  # noqa: PLR2004
-                song.plays = row[2]
-            songs.append(song)
-    return songs
+    return load_cached(file_path, parse_songs, CACHE_DIR)
+
+
+@functools.cache
+def get_config() -> Config:
+    """Retrieve the configuration, checking out the default files on first use."""
+    checkout_files()
+    return load_cached(
+        os.path.join(APP_CONFIG_ROOT, "config.toml"),
+        parse_config,
+        CACHE_DIR,
+    )
+
+
+@functools.cache
+def get_slur_matcher() -> ProfanityMatcher:
+    """Retrieve the matcher of the slurs in the configured slurs file."""
+    slurs_file = os.path.join(APP_CONFIG_ROOT, get_config().general.slurs_file)
+    return load_cached(slurs_file, parse_slurs, CACHE_DIR)
+
+
+@functools.cache
+def get_classics_songs() -> list[Song]:
+    """Retrieve the songs of the configured classics file."""
+    return load_songs_from_csv(
+        os.path.join(APP_CONFIG_ROOT, get_config().general.classics_file),
+    )
+
+
+@functools.cache
+def get_current_charts_songs() -> list[Song]:
+    """Retrieve the songs of the configured current charts file."""
+    return load_songs_from_csv(
+        os.path.join(APP_CONFIG_ROOT, get_config().general.current_charts),
+    )
+
+
+# the language fields set from the server while running, not from the config.toml
+RUNTIME_LANGUAGE_FIELDS = {"rotating_banner"}
+
+
+def diff_config(old: Config, new: Config) -> set[str]:
+    """Function to find the settings which differ between `old` and `new`.
+
+    The RUNTIME_LANGUAGE_FIELDS are ignored, as the loaded configuration holds the
+    texts of the server instead of those of the file.
+
+    Returns:
+        the changed settings as "section.field", or "section" for lists.
+    """
+    changed = set()
+    for section in Config.model_fields:
+        if section == "selected_language":
+            continue
+        old_value, new_value = getattr(old, section), getattr(new, section)
+        if isinstance(new_value, BaseModel):
+            changed.update(
+                f"{section}.{field}"
+                for field in type(new_value).model_fields
+                if getattr(old_value, field) != getattr(new_value, field)
+            )
+        elif section == "languages":
+            if _file_languages(old_value) != _file_languages(new_value):
+                changed.add(section)
+        elif old_value != new_value:
+            changed.add(section)
+    return changed
+
+
+def _file_languages(languages: list[LanguageConfig]) -> list[dict]:
+    return [
+        language.model_dump(exclude=RUNTIME_LANGUAGE_FIELDS) for language in languages
+    ]
+
+
+def reload_config() -> set[str]:
+    """Reload the config.toml and update the loaded configuration in place.
+
+    Only the changed sections are replaced, so everyone holding CONFIG sees the
+    changes. The selected language is kept if it still exists, and the
+    RUNTIME_LANGUAGE_FIELDS of each language are kept as well.
+
+    Raises:
+        ValueError: if the config.toml is invalid, the loaded configuration is kept.
+
+    Returns:
+        the changed settings, see `diff_config`.
+    """
+    config = get_config()
+    new = load_cached(
+        os.path.join(APP_CONFIG_ROOT, "config.toml"),
+        parse_config,
+        CACHE_DIR,
+    )
+    changed = diff_config(config, new)
+    runtime = {
+        language.language_name: language.model_dump(include=RUNTIME_LANGUAGE_FIELDS)
+        for language in config.languages
+    }
+    for section in {setting.split(".")[0] for setting in changed}:
+        setattr(config, section, getattr(new, section))
+
+    if "languages" in changed:
+        for language in config.languages:
+            for field, value in runtime.get(language.language_name, {}).items():
+                setattr(language, field, value)
+
+    if "languages" in changed and config.selected_language is not None:
+        name = config.selected_language.language_name
+        config.selected_language = next(
+            (lang for lang in config.languages if lang.language_name == name),
+            config.languages[0],
+        )
+    return changed
+
+
+# the data files by name, with their getter, parser and setting of their path
+_DATA_FILES = {
+    "slurs": (get_slur_matcher, parse_slurs, "slurs_file"),
+    "classics": (get_classics_songs, parse_songs, "classics_file"),
+    "current_charts": (get_current_charts_songs, parse_songs, "current_charts"),
+}
+
+
+def reload_data_files() -> set[str]:
+    """Reload the data files whose content changed.
+
+    A file which cannot be parsed is skipped and its loaded content kept.
+
+    Returns:
+        the names of the changed files: "slurs", "classics" or "current_charts".
+    """
+    changed = set()
+    for name, (getter, parse, setting) in _DATA_FILES.items():
+        path = os.path.join(APP_CONFIG_ROOT, getattr(get_config().general, setting))
+        try:
+            content = load_cached(path, parse, CACHE_DIR)
+        except (OSError, ValueError, IndexError):
+            logging.exception("Keeping the loaded %s, could not read '%s'", name, path)
+            continue
+        if content != getter():
+            getter.cache_clear()
+            changed.add(name)
+    return changed
+
+
+def contains_slur(text: str) -> bool:
+    """Function to check if a text contains a slur, see ProfanityMatcher."""
+    return text in get_slur_matcher()
+
 
+# nothing is loaded on import, the constants are loaded on first access instead
+_LAZY_CONSTANTS = {
+    "ASSETS": get_assets_path,
+    "CONFIG": get_config,
+    "SLURS": get_slur_matcher,
+    "CLASSICS_SONGS": get_classics_songs,
+    "CURRENT_CHARTS_SONGS": get_current_charts_songs,
+}
 
-classics_file = os.path.join(APP_CONFIG_ROOT, CONFIG.general.classics_file)
-CLASSICS_SONGS = load_songs_from_csv(classics_file)
 
-current_charts_file = os.path.join(APP_CONFIG_ROOT, CONFIG.general.current_charts)
-CURRENT_CHARTS_SONGS = load_songs_from_csv(current_charts_file)
+def __getattr__(name: str) -> object:
+    """Load the module constants on first access."""
+    if (getter := _LAZY_CONSTANTS.get(name)) is not None:
+        return getter()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
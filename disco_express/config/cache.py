@@ -0,0 +1,109 @@
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from collections.abc import Callable
+from typing import TypeVar
+
+from . import models, profanity
+
+# increase when the layout of the cache entries changes
+CACHE_VERSION = 1
+
+T = TypeVar("T")
+
+
+@functools.cache
+def code_fingerprint() -> str:
+    """Function to identify the code the cached data was parsed and validated with.
+
+    Changing the parse functions, the config models or the profanity matcher changes
+    how files are parsed, so the fingerprint is built from their modules, or from the
+    executable in frozen builds.
+    """
+    if getattr(sys, "frozen", False):
+        paths = [sys.executable]
+    else:
+        # the parse functions live in the package itself, which imports this module
+        package = os.path.join(os.path.dirname(__file__), "__init__.py")
+        paths = [package, models.__file__, profanity.__file__]
+    stats = [os.stat(path) for path in paths]
+    return "-".join(
+        [str(CACHE_VERSION)] + [f"{st.st_mtime_ns}-{st.st_size}" for st in stats],
+    )
+
+
+def load_cached(path: str, parse: Callable[[bytes], T], cache_dir: str) -> T:
+    """Function to load the file `path` parsed by `parse`, using an on-disk cache.
+
+    The parsed data is pickled into `cache_dir`, named after the full path of the
+    file, so files of the same name in different directories do not share an entry.
+    As long as modification time and size of the file are unchanged, the pickle is
+    used without reading the file. If only the modification time changed, e.g. the
+    file was copied, the pickle is still used if the hash of the content matches.
+
+    Args:
+        path: the path of the file
+        parse: the function parsing the content of the file
+        cache_dir: the directory the cache is stored in
+    """
+    stat = os.stat(path)
+    path_hash = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:16]
+    cache_file = os.path.join(
+        cache_dir,
+        f"{os.path.basename(path)}-{path_hash}.pickle",
+    )
+    entry = _read_entry(cache_file)
+    if entry is not None and (entry["mtime_ns"], entry["size"]) == (
+        stat.st_mtime_ns,
+        stat.st_size,
+    ):
+        return entry["value"]
+
+    with open(path, "rb") as file:
+        data = file.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if entry is not None and entry["sha256"] == digest:
+        value = entry["value"]
+    else:
+        logging.debug("Parsing '%s'", path)
+        value = parse(data)
+
+    _write_entry(
+        cache_file,
+        {
+            "fingerprint": code_fingerprint(),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "value": value,
+        },
+    )
+    return value
+
+
+def _read_entry(cache_file: str) -> dict | None:
+    try:
+        with open(cache_file, "rb") as file:
+            entry = pickle.load(file)  # noqa: S301, written by the app itself
+    except FileNotFoundError:
+        return None
+    except Exception:  # noqa: BLE001, a broken cache is simply rebuilt
+        logging.warning("Ignoring broken cache '%s'", cache_file)
+        return None
+    if not isinstance(entry, dict) or entry.get("fingerprint") != code_fingerprint():
+        return None
+    return entry
+
+
+def _write_entry(cache_file: str, entry: dict):
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        part_path = f"{cache_file}.part"
+        with open(part_path, "wb") as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(part_path, cache_file)
+    except OSError as exc:
+        logging.warning("Could not write cache '%s': %s", cache_file, exc)
@@ -1,4 +1,6 @@
 # ruff: noqa: D101
+from enum import Enum
+
 from pydantic import BaseModel
 
 
@@ -8,6 +10,12 @@ class Song(BaseModel):
     plays: int = 0
 
 
+class ChartsMode(Enum):
+    ALL_TIME = "all_time"
+    WINDOW = "window"
+    DECAY = "decay"
+
+
 class ColorsConfig(BaseModel):
     background_color: str
 
@@ -66,16 +74,39 @@ class LanguageConfig(BaseModel):
 
     classics_artist_description: str
     classics_song_description: str
+    quick_selection_search: str = "Search title or artist"
 
     loading_description: list[str]
     loading_success: str
+    loading_queued: str = "Your music wish is queued and will be sent shortly!"
+
+    outbox_pending: str = "{} music wish(es) waiting to be sent ..."
 
     rotating_banner: str = "---"
 
 
+class ServerConfig(BaseModel):
+    ip: str
+    port: int = 8080
+
+
 class NetworkConfig(BaseModel):
     server_ip: str
     server_port: int
+    standby_servers: list[ServerConfig] = []
+    server_probe_interval: int = 30
+
+    pool_size: int = 4
+    connect_timeout: float = 3.0
+    read_timeout: float = 10.0
+    breaker_failure_threshold: int = 3
+    breaker_reset_timeout: float = 10.0
+
+    max_download_concurrency: int = 3
+    max_download_rate: int = 0
+
+    push_enabled: bool = True
+    push_read_timeout: float = 30.0
 
 
 class IconsConfig(BaseModel):
@@ -96,6 +127,7 @@ class GeneralConfig(BaseModel):
 
     classics_file: str
     charts_file: str
+    outbox_file: str = "data/outbox.sqlite3"
     slurs_file: str
     current_charts: str
 
@@ -104,12 +136,18 @@ class GeneralConfig(BaseModel):
 
     auto_close_time: int
     server_refresh_interval: int
+    banner_refresh_interval: int = 10
+    documents_refresh_interval: int = 10
+    max_poll_backoff: int = 60
     wish_sending_time: int
     banner_speed: int
 
     max_input_length: int
     max_input_length_message: int
     min_charts_threshold: int
+    charts_mode: ChartsMode = ChartsMode.ALL_TIME
+    charts_window_hours: float = 6.0
+    charts_half_life_hours: float = 2.0
 
 
 class Config(BaseModel):
@@ -0,0 +1,122 @@
+import itertools
+import re
+import unicodedata
+from collections.abc import Iterable
+
+# characters commonly used in place of letters
+LEET = str.maketrans(
+    {
+        "0": "o",
+        "1": "i",
+        "3": "e",
+        "4": "a",
+        "5": "s",
+        "7": "t",
+        "8": "b",
+        "@": "a",
+        "$": "s",
+        "!": "i",
+        "|": "i",
+        "+": "t",
+    },
+)
+# the minimum amount of single letters in a row, which are also matched joined
+MIN_SPELLED_OUT = 3
+
+_STRIP = "".join(char for char in map(chr, range(128)) if not char.isalnum())
+_STRIP = _STRIP.replace("@", "").replace("$", "")
+_REPEATED = re.compile(r"(.)\1{2,}")
+
+
+def normalize(text: str, fold: bool = True) -> list[str]:
+    """Function to split `text` into normalized tokens for matching.
+
+    Lowercases, splits at punctuation and joins spelled out words like "f u c k" or
+    "f.u.c.k". With `fold`, the text is casefolded instead, and diacritics and
+    leetspeak inside words are replaced as well.
+    """
+    if fold:
+        text = unicodedata.normalize("NFKD", text.casefold())
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    else:
+        text = unicodedata.normalize("NFC", text.lower())
+
+    tokens = []
+    for word in text.split():
+        stripped = word.strip(_STRIP)
+        if fold and not stripped.isdigit():
+            stripped = stripped.translate(LEET)
+        tokens.extend(token for token in re.split(r"\W+|_", stripped) if token)
+
+    joined = []
+    for single, group in itertools.groupby(tokens, key=lambda token: len(token) == 1):
+        letters = list(group)
+        if single and len(letters) >= MIN_SPELLED_OUT:
+            joined.append("".join(letters))
+        else:
+            joined.extend(letters)
+    return joined
+
+
+def variants(token: str) -> set[str]:
+    """Function to retrieve the spellings of `token` with repeated letters reduced."""
+    return {token, _REPEATED.sub(r"\1\1", token), _REPEATED.sub(r"\1", token)}
+
+
+class ProfanityMatcher:
+    """Matcher finding words and phrases of a list in normalized text.
+
+    Single words are looked up in a hashed set and phrases as n-grams of the text's
+    tokens, so a check costs the same regardless of the length of the list.
+
+    The words are only lowercased, while the text is matched both lowercased and
+    folded, see `normalize`. So "f4ck" is found, but "Bär" in the list does not
+    block "Bar".
+
+    Args:
+        entries: the words and phrases to find
+    """
+
+    def __init__(self, entries: Iterable[str]):
+        self.words = set()
+        self.phrases = set()
+        for entry in entries:
+            tokens = normalize(entry, fold=False)
+            if len(tokens) == 1:
+                self.words.add(tokens[0])
+            elif tokens:
+                self.phrases.add(tuple(tokens))
+                # also match the phrase written as one word, e.g. "buttfuck"
+                self.words.add("".join(tokens))
+        self.phrase_lengths = sorted({len(phrase) for phrase in self.phrases})
+
+    def find(self, text: str) -> str | None:
+        """Find the first word or phrase in `text`, None if there is none."""
+        for fold in (False, True):
+            if (found := self._find_tokens(normalize(text, fold=fold))) is not None:
+                return found
+        return None
+
+    def _find_tokens(self, tokens: list[str]) -> str | None:
+        for token in tokens:
+            if found := variants(token) & self.words:
+                return found.pop()
+        for length in self.phrase_lengths:
+            for start in range(len(tokens) - length + 1):
+                if (phrase := tuple(tokens[start : start + length])) in self.phrases:
+                    return " ".join(phrase)
+        return None
+
+    def __contains__(self, text: str) -> bool:
+        """Check if `text` contains any of the words or phrases."""
+        return self.find(text) is not None
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the words and phrases of two matchers."""
+        if not isinstance(other, ProfanityMatcher):
+            return NotImplemented
+        return (self.words, self.phrases) == (other.words, other.phrases)
+
+    def __len__(self) -> int:
+        """Retrieve the amount of words and phrases."""
+        return len(self.words)
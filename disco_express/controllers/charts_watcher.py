@@ -0,0 +1,62 @@
+import logging
+import os
+
+from PyQt6 import QtCore
+
+from disco_express.models import ChartsManager
+
+# the delay in ms before reloading, so a sync can finish writing the file
+RELOAD_DELAY = 500
+
+
+class ChartsWatcher(QtCore.QObject):
+    """Reloads a ChartsManager when its charts file is replaced by another process.
+
+    rsync replaces the file by renaming a temporary file over it, which ends the
+    watch of the file. Therefore the directory of the file is watched as well and the
+    file is watched again after every change.
+
+    Args:
+        charts_manager: the charts manager to reload
+        parent: the parent of the watcher
+    """
+
+    charts_changed = QtCore.pyqtSignal()
+
+    def __init__(
+        self,
+        charts_manager: ChartsManager,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.charts_manager = charts_manager
+        self.charts_file = os.path.abspath(charts_manager.charts_file)
+
+        self._reload_timer = QtCore.QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(RELOAD_DELAY)
+        self._reload_timer.timeout.connect(self.reload)
+
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.addPath(os.path.dirname(self.charts_file))
+        self._watch_file()
+        self._watcher.fileChanged.connect(self._reload_timer.start)
+        self._watcher.directoryChanged.connect(self._reload_timer.start)
+
+    @QtCore.pyqtSlot()
+    def reload(self):
+        """Reload the charts, if the charts file was replaced."""
+        self._watch_file()
+        try:
+            changed = self.charts_manager.reload()
+        except OSError:
+            logging.exception("Could not reload the charts '%s'", self.charts_file)
+            return
+        if changed:
+            self.charts_changed.emit()
+
+    def _watch_file(self):
+        if os.path.isfile(self.charts_file) and (
+            self.charts_file not in self._watcher.files()
+        ):
+            self._watcher.addPath(self.charts_file)
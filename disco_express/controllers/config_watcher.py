@@ -0,0 +1,97 @@
+import logging
+import os
+
+from PyQt6 import QtCore
+
+from disco_express.config import (
+    APP_CONFIG_ROOT,
+    CONFIG,
+    reload_config,
+    reload_data_files,
+)
+
+# the delay in ms before reloading, so an editor or sync can finish writing
+RELOAD_DELAY = 500
+
+
+class ConfigWatcher(QtCore.QObject):
+    """Reloads the config.toml and the data files when they are changed on disk.
+
+    Invalid changes are rejected and the running configuration is kept. Like the
+    ChartsWatcher, the directories of the files are watched as well, as editors and
+    rsync replace files by renaming a new file over them.
+
+    Args:
+        parent: the parent of the watcher
+    """
+
+    config_changed = QtCore.pyqtSignal(set)
+
+    def __init__(self, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self._stamps = {}
+
+        self._reload_timer = QtCore.QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(RELOAD_DELAY)
+        self._reload_timer.timeout.connect(self.reload)
+
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._reload_timer.start)
+        self._watcher.directoryChanged.connect(self._reload_timer.start)
+        self._watch_files()
+
+    @property
+    def files(self) -> list[str]:
+        """The paths of the config.toml and of the configured data files."""
+        general = CONFIG.general
+        return [
+            os.path.join(APP_CONFIG_ROOT, path)
+            for path in (
+                "config.toml",
+                general.slurs_file,
+                general.classics_file,
+                general.current_charts,
+            )
+        ]
+
+    @QtCore.pyqtSlot()
+    def reload(self):
+        """Reload all changed files and announce the changed settings."""
+        if not self._watch_files():
+            return
+
+        changed = set()
+        try:
+            changed |= reload_config()
+        except (OSError, ValueError) as exc:
+            logging.warning(
+                "Rejected the changed config.toml, keeping the running one: %s",
+                exc,
+            )
+        changed |= reload_data_files()
+        # the paths of the data files may have changed
+        self._watch_files()
+        if changed:
+            logging.info("Reloaded configuration: %s", ", ".join(sorted(changed)))
+            self.config_changed.emit(changed)
+
+    def _watch_files(self) -> bool:
+        # watch all files and their directories, returns if any file was modified
+        modified = False
+        stamps = {}
+        for path in self.files:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stamps[path] = None
+            else:
+                stamps[path] = (stat.st_mtime_ns, stat.st_size)
+                if path not in self._watcher.files():
+                    self._watcher.addPath(path)
+            directory = os.path.dirname(path)
+            if directory not in self._watcher.directories():
+                self._watcher.addPath(directory)
+            modified |= stamps[path] != self._stamps.get(path, stamps[path])
+        self._stamps = stamps
+        return modified
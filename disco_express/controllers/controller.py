@@ -1,14 +1,67 @@
+import functools
 import logging
+import os
 from typing import Generic, TypeVar
 
 from PyQt6 import QtCore, QtWidgets
 
-from disco_express.config import CONFIG
+from disco_express.config import APP_CONFIG_ROOT, CONFIG
 from disco_express.config.models import LanguageConfig
+from disco_express.models import (
+    ChartsManager,
+    CircuitBreaker,
+    JukeBoxClient,
+    get_song_index,
+)
 
 V = TypeVar("V")
 
 
+@functools.cache
+def get_jukebox_client() -> JukeBoxClient:
+    """Retrieve the JukeBoxClient shared by all controllers.
+
+    Sharing one client lets all controllers reuse the same pooled connections.
+    """
+    return JukeBoxClient.from_config(CONFIG.network)
+
+
+@functools.cache
+def get_charts_manager() -> ChartsManager:
+    """Retrieve the ChartsManager shared by all controllers and views.
+
+    The charts are loaded once, so all views show the same plays.
+    """
+    return ChartsManager(
+        os.path.join(APP_CONFIG_ROOT, CONFIG.general.charts_file),
+        charts_threshold=CONFIG.general.min_charts_threshold,
+        index=get_song_index(),
+        mode=CONFIG.general.charts_mode,
+        window_hours=CONFIG.general.charts_window_hours,
+        half_life_hours=CONFIG.general.charts_half_life_hours,
+    )
+
+
+class CircuitBreakerMonitor(QtCore.QObject):
+    """Relays the state changes of a CircuitBreaker to the GUI thread.
+
+    Args:
+        breaker: the monitored circuit breaker
+    """
+
+    state_changed = QtCore.pyqtSignal(object)
+
+    def __init__(self, breaker: CircuitBreaker):
+        super().__init__()
+        breaker.on_state_change = self.state_changed.emit
+
+
+@functools.cache
+def get_breaker_monitor() -> CircuitBreakerMonitor:
+    """Retrieve the monitor of the circuit breaker of the shared JukeBoxClient."""
+    return CircuitBreakerMonitor(get_jukebox_client().breaker)
+
+
 class Controller(QtCore.QObject, Generic[V]):
     """Base class for a controller."""
 
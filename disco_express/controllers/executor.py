@@ -0,0 +1,112 @@
+import functools
+import itertools
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from PyQt6 import QtCore
+
+from disco_express.config import CONFIG
+
+
+class _TaskSignals(QtCore.QObject):
+    """Signals emitted by a `_Task` from its worker thread."""
+
+    succeeded = QtCore.pyqtSignal(int, object)
+    failed = QtCore.pyqtSignal(int, Exception)
+
+
+class _Task(QtCore.QRunnable):
+    """Runnable executing a blocking call on a worker thread of the QThreadPool.
+
+    Args:
+        task_id: the id used to map the outcome back to its callbacks
+        func: the blocking function which should be called
+        args: the positional arguments passed to `func`
+        kwargs: the keyword arguments passed to `func`
+    """
+
+    def __init__(self, task_id: int, func: Callable[..., Any], *args, **kwargs):
+        super().__init__()
+        self.task_id = task_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _TaskSignals()
+
+    def run(self):
+        """Call the function and emit its outcome."""
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as exc:  # noqa: BLE001, handed over to the GUI thread
+            self.signals.failed.emit(self.task_id, exc)
+        else:
+            self.signals.succeeded.emit(self.task_id, result)
+
+
+class RequestExecutor(QtCore.QObject):
+    """Executor running blocking server calls off the Qt GUI thread.
+
+    The outcome of each call is delivered back to the GUI thread through Qt signals,
+    so the callbacks can safely update widgets.
+
+    Args:
+        max_threads: the maximum amount of calls running at the same time.
+    """
+
+    def __init__(self, max_threads: int = 4):
+        super().__init__()
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._task_ids = itertools.count()
+        self._tasks = {}
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args,
+        on_result: Callable[[Any], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        **kwargs,
+    ):
+        """Run `func` on a worker thread.
+
+        Args:
+            func: the blocking function to run
+            args: the positional arguments passed to `func`
+            on_result: called in the GUI thread with the return value of `func`
+            on_error: called in the GUI thread with the exception raised by `func`
+            kwargs: the keyword arguments passed to `func`
+        """
+        task_id = next(self._task_ids)
+        task = _Task(task_id, func, *args, **kwargs)
+        task.setAutoDelete(False)
+        task.signals.succeeded.connect(self._on_task_succeeded)
+        task.signals.failed.connect(self._on_task_failed)
+        # keep the task alive until its outcome was delivered to the GUI thread
+        self._tasks[task_id] = (task, on_result, on_error)
+        self._pool.start(task)
+
+    def wait_for_done(self, timeout: int = -1) -> bool:
+        """Block until all submitted calls are finished or `timeout` ms passed."""
+        return self._pool.waitForDone(timeout)
+
+    @QtCore.pyqtSlot(int, object)
+    def _on_task_succeeded(self, task_id: int, result: Any):  # noqa: ANN401
+        _, on_result, _ = self._tasks.pop(task_id)
+        if on_result is not None:
+            on_result(result)
+
+    @QtCore.pyqtSlot(int, Exception)
+    def _on_task_failed(self, task_id: int, exc: Exception):
+        _, _, on_error = self._tasks.pop(task_id)
+        if on_error is None:
+            logging.error("Unhandled error in background request", exc_info=exc)
+            return
+        on_error(exc)
+
+
+@functools.cache
+def get_request_executor() -> RequestExecutor:
+    """Retrieve the RequestExecutor shared by all controllers."""
+    return RequestExecutor(max_threads=CONFIG.network.pool_size)
@@ -3,10 +3,11 @@ import logging
 from PyQt6 import QtCore
 
 from disco_express.config import CONFIG
-from disco_express.models.jukebox_client import JukeBoxClient, JukeBoxConnectionError
+from disco_express.models.jukebox_client import BannerSchema
 from disco_express.views import HomeView
 
-from .controller import Controller
+from .controller import Controller, get_jukebox_client
+from .poll_scheduler import get_poll_scheduler
 
 
 class HomeController(Controller[HomeView]):
@@ -15,18 +16,18 @@ class HomeController(Controller[HomeView]):
     def __init__(self):
         super().__init__(HomeView)
 
-        self.timer = QtCore.QTimer(self)
-        self.timer.setInterval(10000)
-        self.timer.timeout.connect(self.refresh_banner)
-        self.timer.start()
+        self._banner_texts = None
 
-        self.jukebox_client = JukeBoxClient(
-            CONFIG.network.server_ip,
-            CONFIG.network.server_port,
+        self.jukebox_client = get_jukebox_client()
+        self.scheduler = get_poll_scheduler()
+        self.scheduler.register(
+            "banner",
+            CONFIG.general.banner_refresh_interval,
+            self.jukebox_client.get_banner_texts,
+            on_result=self.set_banner_texts,
+            on_error=self._on_banner_error,
         )
 
-        self.refresh_banner()
-
     def connect_view(self):
         """Overwrite method because its parent is abstract."""
 
@@ -42,12 +43,14 @@ class HomeController(Controller[HomeView]):
 
     @QtCore.pyqtSlot()
     def refresh_banner(self):
-        """Method to load and display the banner texts."""
-        try:
-            banner_texts = self.jukebox_client.get_banner_texts()
-        except JukeBoxConnectionError as exc:
-            logging.exception("Error retrieving banner texts", exc_info=exc)
+        """Method to load the banner texts in the background and display them."""
+        self.scheduler.trigger("banner")
+
+    def set_banner_texts(self, banner_texts: BannerSchema):
+        """Method to display the retrieved `banner_texts`."""
+        if banner_texts == self._banner_texts:
             return
+        self._banner_texts = banner_texts
 
         for index, language in enumerate(CONFIG.languages):
             CONFIG.languages[index].rotating_banner = getattr(
@@ -60,3 +63,6 @@ class HomeController(Controller[HomeView]):
             CONFIG.selected_language.language_name,
         )
         self.set_selected_language()
+
+    def _on_banner_error(self, exc: Exception):
+        logging.error("Error retrieving banner texts", exc_info=exc)
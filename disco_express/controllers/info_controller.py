@@ -1,13 +1,14 @@
+import logging
 import os
-import shutil
 
 from PyQt6 import QtCore
 
 from disco_express.config import APP_CONFIG_ROOT, CONFIG
-from disco_express.models import JukeBoxClient, JukeBoxConnectionError
+from disco_express.models import DocumentSync, JukeBoxConnectionError, RateLimiter
 from disco_express.views import InfoView
 
-from .controller import Controller
+from .controller import Controller, get_jukebox_client
+from .poll_scheduler import get_poll_scheduler
 
 
 class InfoController(Controller[InfoView]):
@@ -16,18 +17,21 @@ class InfoController(Controller[InfoView]):
     def __init__(self):
         super().__init__(InfoView)
 
-        self._document_cache = []
-
-        self.jukebox_client = JukeBoxClient(
-            CONFIG.network.server_ip,
-            CONFIG.network.server_port,
+        self.jukebox_client = get_jukebox_client()
+        self.document_sync = DocumentSync(
+            self.jukebox_client,
+            os.path.join(APP_CONFIG_ROOT, CONFIG.general.documents_directory),
+            max_concurrency=CONFIG.network.max_download_concurrency,
+            rate_limiter=RateLimiter(CONFIG.network.max_download_rate),
+        )
+        self.scheduler = get_poll_scheduler()
+        self.scheduler.register(
+            "documents",
+            CONFIG.general.documents_refresh_interval,
+            self.document_sync.sync,
+            on_result=self._on_docs_refreshed,
+            on_error=self._on_docs_error,
         )
-        self.refresh_docs()
-
-        self.timer = QtCore.QTimer()
-        self.timer.setInterval(10000)
-        self.timer.timeout.connect(self.refresh_docs)
-        self.timer.start()
 
     def connect_view(self):
         """Overwrite method because its parent is abstract."""
@@ -41,24 +45,17 @@ class InfoController(Controller[InfoView]):
 
     @QtCore.pyqtSlot()
     def refresh_docs(self):
-        """Method to check for new documents and load them if available.
+        """Method to check for new documents in the background and load them if available.
 
-        Loads all documents to CONFIG.general.documents_directory.
+        Only new or changed documents are downloaded to CONFIG.general.documents_directory.
         """
-        try:
-            documents = self.jukebox_client.list_documents()
-            if documents == self._document_cache:
-                return
+        self.scheduler.trigger("documents")
 
-            docs_dir = os.path.join(APP_CONFIG_ROOT, CONFIG.general.documents_directory)
-            if os.path.isdir(docs_dir):
-                shutil.rmtree(docs_dir)
-            os.makedirs(docs_dir)
-            for doc in documents:
-                self.jukebox_client.get_document(doc, docs_dir)
-
-            self._document_cache = documents
-        except JukeBoxConnectionError:
-            pass
-        finally:
+    def _on_docs_refreshed(self, changed: bool):
+        if changed:
             self.view.list_documents()
+
+    def _on_docs_error(self, exc: Exception):
+        if not isinstance(exc, JukeBoxConnectionError):
+            logging.error("Error refreshing documents", exc_info=exc)
+        self.view.list_documents()
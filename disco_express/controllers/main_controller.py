@@ -1,14 +1,54 @@
+import itertools
 import logging
+import operator
+import os
+import threading
+import time
 
-from PyQt6 import QtCore
+from PyQt6 import QtCore, QtWidgets
 
-from disco_express.config import CONFIG
+from disco_express.config import (
+    APP_CONFIG_ROOT,
+    CONFIG,
+    get_classics_songs,
+    get_current_charts_songs,
+)
+from disco_express.models import get_song_index
 from disco_express.views import MainView
+from disco_express.views.helpers import build_stylesheet
 
-from .controller import Controller
+from .config_watcher import ConfigWatcher
+from .controller import Controller, get_charts_manager, get_jukebox_client
 from .home_controller import HomeController
 from .info_controller import InfoController
 from .music_wish_controller import MusicController
+from .poll_scheduler import get_poll_scheduler
+from .push_listener import PushListener
+
+# the poll jobs made redundant by an open push channel
+PUSHED_JOBS = ("status", "banner", "documents")
+# the poll jobs whose interval is changed live by each setting
+INTERVAL_SETTINGS = {
+    "general.server_refresh_interval": "status",
+    "general.banner_refresh_interval": "banner",
+    "general.documents_refresh_interval": "documents",
+    "network.server_probe_interval": "servers",
+}
+# the settings read on every use, which apply live by themselves
+LIVE_SETTINGS = {
+    "general.auto_close_time",
+    "general.wish_sending_time",
+    "icons.artist_icon",
+    "icons.charts_plays_icon",
+    "icons.song_icon",
+    "slurs",
+}
+# the settings applied by setting the selected language again
+LANGUAGE_SETTINGS = {
+    "languages",
+    "general.app_name",
+    "general.max_input_length_message",
+}
 
 
 class MainController(Controller[MainView]):
@@ -51,9 +91,52 @@ class MainController(Controller[MainView]):
             lambda: self.switch_page(self.info_index),
         )
 
+        self.view.metrics_requested.connect(self.dump_metrics)
+
+        client = get_jukebox_client()
+        if len(client.servers) > 1:
+            get_poll_scheduler().register(
+                "servers",
+                CONFIG.network.server_probe_interval,
+                client.probe_servers,
+                probes_server=False,
+            )
+
         self.set_selected_language()
         self.switch_page(0)
 
+        if CONFIG.network.push_enabled:
+            self.connect_push_listener()
+
+        self.config_watcher = ConfigWatcher(self)
+        self.config_watcher.config_changed.connect(self.apply_config)
+
+    def connect_push_listener(self):
+        """Start listening on the server's push channel.
+
+        While the channel is open, the polls of the pushed resources are paused.
+        """
+        self.push_listener = PushListener(
+            get_jukebox_client(),
+            read_timeout=CONFIG.network.push_read_timeout,
+            max_backoff=CONFIG.general.max_poll_backoff,
+        )
+        self.push_listener.status_received.connect(
+            self.ctrl_music.set_connection_status,
+        )
+        self.push_listener.banner_received.connect(self.ctrl_home.set_banner_texts)
+        self.push_listener.documents_received.connect(self.ctrl_info.refresh_docs)
+        self.push_listener.connected_changed.connect(self.set_push_connected)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.push_listener.stop)
+        self.push_listener.start()
+
+    @QtCore.pyqtSlot(bool)
+    def set_push_connected(self, connected: bool):
+        """Pause the polls of all pushed resources while the push channel is open."""
+        scheduler = get_poll_scheduler()
+        for name in PUSHED_JOBS:
+            scheduler.set_paused(name, connected)
+
     @QtCore.pyqtSlot()
     def set_selected_language(self):
         """Method to change the language, invokes language changes to all subcontrollers as well."""
@@ -66,6 +149,77 @@ class MainController(Controller[MainView]):
         self.ctrl_info.set_selected_language()
         self.ctrl_home.set_selected_language()
 
+    @QtCore.pyqtSlot(set)
+    def apply_config(self, changed: set[str]):
+        """Apply the `changed` settings of a reloaded configuration to the running app.
+
+        Settings which are only read on startup are logged to take effect after a
+        restart.
+        """
+        applied = set()
+        if style := {setting for setting in changed if setting.startswith("style.")}:
+            QtWidgets.QApplication.instance().setStyleSheet(build_stylesheet())
+            applied |= style
+
+        if changed & LANGUAGE_SETTINGS:
+            self.ctrl_home.view.language_widget.update_languages(CONFIG.languages)
+            self.set_selected_language()
+            applied |= LANGUAGE_SETTINGS
+
+        scheduler = get_poll_scheduler()
+        for setting, job in INTERVAL_SETTINGS.items():
+            if setting in changed:
+                scheduler.set_interval(job, operator.attrgetter(setting)(CONFIG))
+                applied.add(setting)
+        if "general.max_poll_backoff" in changed:
+            scheduler.max_backoff = CONFIG.general.max_poll_backoff
+            applied.add("general.max_poll_backoff")
+
+        if "general.min_charts_threshold" in changed:
+            get_charts_manager().charts_threshold = CONFIG.general.min_charts_threshold
+            applied.add("general.min_charts_threshold")
+        if songs := changed & {"classics", "current_charts"}:
+            self.reload_songs()
+            applied |= songs
+
+        if restart := changed - applied - LIVE_SETTINGS:
+            logging.warning(
+                "Changed settings take effect after a restart: %s",
+                ", ".join(sorted(restart)),
+            )
+
+    def reload_songs(self):
+        """Method to bring the known songs in line with the reloaded song lists.
+
+        Songs removed from the classics or current charts are dropped from the
+        suggestions and the search, unless they were played. The indexes are rebuilt
+        in the background.
+        """
+        threading.Thread(target=self._reload_songs, daemon=True).start()
+
+    def _reload_songs(self):
+        index = get_song_index()
+        songs = itertools.chain(get_classics_songs(), get_current_charts_songs())
+        listed = {index.add(song.title, song.artist) for song in songs}
+        removed = get_charts_manager().retain_songs(listed)
+        logging.info("Reloaded the song lists, %s songs removed", removed)
+        self.ctrl_music.update_indexes()
+
+    @QtCore.pyqtSlot()
+    def dump_metrics(self):
+        """Method to write the metrics of all server requests to the log directory."""
+        path = os.path.join(
+            APP_CONFIG_ROOT,
+            CONFIG.general.log_directory,
+            f"metrics_{time.strftime('%Y%m%d_%H%M%S')}.json",
+        )
+        try:
+            get_jukebox_client().metrics.dump(path)
+        except OSError:
+            logging.exception("Could not dump metrics")
+            return
+        logging.info("Dumped metrics to %s", path)
+
     def switch_page(self, index: int):
         """Method to switch the page to the `index`."""
         self.view.home_button.setVisible(index != self.home_index)
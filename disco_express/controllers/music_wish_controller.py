@@ -1,22 +1,36 @@
 import logging
 import os
 import sys
+import threading
 
-from PyQt6 import QtCore
+from PyQt6 import QtCore, QtWidgets
 
 from disco_express.config import APP_CONFIG_ROOT, CONFIG, contains_slur
 from disco_express.config.models import Song
 from disco_express.models import (
-    ChartsManager,
-    JukeBoxClient,
+    BreakerState,
     JukeBoxConnectionError,
     MusicRequest,
+    WishOutbox,
+    get_fuzzy_index,
+    get_prefix_index,
 )
 from disco_express.models.jukebox_client import ServerStatus
 from disco_express.views import MusicWishView, QuickSelectionDialog
 from disco_express.views.widgets import LoadingModal
 
-from .controller import Controller
+from .charts_watcher import ChartsWatcher
+from .controller import (
+    Controller,
+    get_breaker_monitor,
+    get_charts_manager,
+    get_jukebox_client,
+)
+from .poll_scheduler import get_poll_scheduler
+from .wish_sender import WishSender
+
+# the maximum amount of suggestions shown while typing a title or an artist
+MAX_SUGGESTIONS = 8
 
 
 class MusicController(Controller[MusicWishView]):
@@ -26,15 +40,33 @@ class MusicController(Controller[MusicWishView]):
 
     def __init__(self):
 
-        self._client = JukeBoxClient(
-            CONFIG.network.server_ip,
-            CONFIG.network.server_port,
+        self._client = get_jukebox_client()
+        self.scheduler = get_poll_scheduler()
+        self.scheduler.register(
+            "status",
+            CONFIG.general.server_refresh_interval,
+            self._client.get_status,
+            on_result=self.set_connection_status,
+            on_error=self._on_status_error,
+        )
+
+        outbox_path = os.path.join(APP_CONFIG_ROOT, CONFIG.general.outbox_file)
+        self.wish_sender = WishSender(
+            WishOutbox(outbox_path),
+            self._client,
+            self.scheduler,
         )
+        self._pending_wishes = 0
+        self._server_status = ServerStatus.OK
+        # the idempotency key and the LoadingModal of the wish being sent
+        self._sending: tuple[str, LoadingModal] | None = None
 
         super().__init__(MusicWishView)
 
-        charts_path = os.path.join(APP_CONFIG_ROOT, CONFIG.general.charts_file)
-        self.chart_manager = ChartsManager(charts_path)
+        self.chart_manager = get_charts_manager()
+        self.charts_watcher = ChartsWatcher(self.chart_manager, self)
+
+        self.update_indexes()
 
     def connect_view(self):
         """Connect to MusicWishView and set langauges and check for connection."""
@@ -42,6 +74,18 @@ class MusicController(Controller[MusicWishView]):
         self.view.quick_select_button.clicked.connect(self.show_quick_selection)
         self.view.send_button.clicked.connect(self.send_music_request)
 
+        music_title = self.view.music_wish_widget.music_title
+        music_title.suggestions_requested.connect(self.suggest_titles)
+        music_title.suggestion_selected.connect(self.set_song)
+        artist = self.view.music_wish_widget.artist
+        artist.suggestions_requested.connect(self.suggest_artists)
+        artist.suggestion_selected.connect(artist.setText)
+
+        self.wish_sender.pending_changed.connect(self.set_pending_wishes)
+        self.wish_sender.wish_delivered.connect(self.set_wish_delivered)
+        self.wish_sender.wish_rejected.connect(self.show_rejected_wish)
+        get_breaker_monitor().state_changed.connect(self.set_breaker_state)
+
         self.set_selected_language()
         self.check_connection()
 
@@ -74,30 +118,63 @@ class MusicController(Controller[MusicWishView]):
         )
         self.view.music_wish_widget.message.entry.setPlaceholderText(placeholder)
 
+        self.set_pending_wishes(self._pending_wishes)
         self.check_connection()
 
-        self.timer = QtCore.QTimer()
-        self.timer.setInterval(CONFIG.general.server_refresh_interval * 1000)
-        self.timer.timeout.connect(self.check_connection)
-        self.timer.start()
-
     @QtCore.pyqtSlot()
     def show_quick_selection(self):
         """Method to display the QuickSelectionDialog and input the selected song, if available."""
-        quick_selection_dialog = QuickSelectionDialog(self.get_language())
+        quick_selection_dialog = QuickSelectionDialog(
+            self.get_language(),
+            self.chart_manager,
+            get_fuzzy_index(),
+        )
         if quick_selection_dialog.exec() <= 0:
             return
 
-        song = quick_selection_dialog.selected_song
+        self.set_song(quick_selection_dialog.selected_song)
+
+    def update_indexes(self):
+        """Method to build the indexes of the suggestions and the search in the background.
+
+        The indexes follow the shared SongIndex, so they are ready before the next
+        keystroke after songs were added to or removed from it.
+        """
+        for index in (get_prefix_index(), get_fuzzy_index()):
+            threading.Thread(target=index.update, daemon=True).start()
+
+    @QtCore.pyqtSlot(object)
+    def set_song(self, song: Song):
+        """Method to fill in the title and the artist of `song`."""
         self.view.music_wish_widget.music_title.setText(song.title)
         self.view.music_wish_widget.artist.setText(song.artist)
 
+    @QtCore.pyqtSlot(str)
+    def suggest_titles(self, text: str):
+        """Method to suggest the known songs whose title starts with `text`."""
+        songs = get_prefix_index().titles(text, MAX_SUGGESTIONS) if text.strip() else []
+        self.view.music_wish_widget.music_title.show_suggestions(
+            [(f"{song.title} - {song.artist}", song) for song in songs],
+        )
+
+    @QtCore.pyqtSlot(str)
+    def suggest_artists(self, text: str):
+        """Method to suggest the known artists starting with `text`."""
+        artists = (
+            get_prefix_index().artists(text, MAX_SUGGESTIONS) if text.strip() else []
+        )
+        self.view.music_wish_widget.artist.show_suggestions(
+            [(artist, artist) for artist in artists],
+        )
+
     @QtCore.pyqtSlot()
     def send_music_request(self):
         """Method to send the music request entered by the user.
 
         Checks if necessary inputs are available and checks for profanity before sending.
-        Removes all input upon sending.
+        The request is stored in the outbox and delivered in the background, so it is
+        not lost if the server is unreachable. Removes all input upon sending, unless
+        the server rejects the request while it is being sent.
         """
         title = self.view.music_wish_widget.music_title.text()
         if title is None:
@@ -121,25 +198,16 @@ class MusicController(Controller[MusicWishView]):
             self.show_error(error_message)
             return
 
-        try:
-            error = self._client.send_music_request(music_request)
-        except JukeBoxConnectionError:
-            logging.exception("Cannot send music request")
-            self.show_error("Cannot reach the Jukebox Server. Please inform an Admin!")
-            return
-
-        if error is not None:
-            if error.status == "unavailable":
-                self.show_error(self.get_language().error_dj_unavailable)
-            else:
-                self.show_error(self.get_language().error_network)
-
+        loading_modal = LoadingModal()
+        self._sending = (self.wish_sender.add(music_request), loading_modal)
         self.chart_manager.add_song(song=Song(title=title, artist=interpret))
 
         self.view.setDisabled(True)
-        loading_modal = LoadingModal()
-        loading_modal.exec()
+        result = loading_modal.exec()
         self.view.setDisabled(False)
+        self._sending = None
+        if result != QtWidgets.QDialog.DialogCode.Accepted:
+            return
 
         self.view.music_wish_widget.music_title.setText("")
         self.view.music_wish_widget.artist.setText("")
@@ -149,30 +217,75 @@ class MusicController(Controller[MusicWishView]):
 
         self.music_request_sent.emit()
 
+    @QtCore.pyqtSlot(int)
+    def set_pending_wishes(self, pending: int):
+        """Method to display the amount of wishes waiting in the outbox."""
+        self._pending_wishes = pending
+        label = self.view.outbox_label
+        label.setText(self.get_language().outbox_pending.format(pending))
+        label.setVisible(pending > 0)
+
+    @QtCore.pyqtSlot(str)
+    def set_wish_delivered(self, key: str):
+        """Method to report the wish with the idempotency key `key` as sent."""
+        if self._sending is not None and self._sending[0] == key:
+            self._sending[1].set_delivered()
+
+    @QtCore.pyqtSlot(str, str)
+    def show_rejected_wish(self, key: str, error: str):
+        """Method to inform the guest that the server rejected a wish.
+
+        A wish which is still being sent is not reported as sent and keeps its input.
+        """
+        logging.debug("Music wish %s rejected: %s", key, error)
+        if self._sending is not None and self._sending[0] == key:
+            self._sending[1].reject()
+
+        language = self.get_language()
+        if self._server_status == ServerStatus.UNAVAILABLE:
+            self.show_error(language.error_dj_unavailable)
+        else:
+            self.show_error(language.error_network)
+
     @QtCore.pyqtSlot()
     def check_connection(self):
-        """Method to retrieve the current server status and display it."""
-        try:
-            status = self._client.get_status()
-            self.set_connection_status(status)
-        except JukeBoxConnectionError as exc:
+        """Method to retrieve the current server status in the background and display it."""
+        self.scheduler.trigger("status")
+
+    def _on_status_error(self, exc: Exception):
+        self.set_connection_status(ServerStatus.ERROR)
+        if isinstance(exc, JukeBoxConnectionError):
+            logging.warning("Connection error: %s", exc)
+        else:
+            logging.error("Connection error", exc_info=exc)
+
+    @QtCore.pyqtSlot(object)
+    def set_breaker_state(self, state: BreakerState):
+        """Method to display an outage as soon as any request finds the server unreachable.
+
+        Once the server is reachable again, its actual status is retrieved.
+        """
+        if state == BreakerState.OPEN:
             self.set_connection_status(ServerStatus.ERROR)
-            logging.exception("Connection error", exc_info=exc)
+        elif state == BreakerState.CLOSED:
+            self.check_connection()
 
     def set_connection_status(self, status: ServerStatus):
         """Method to display the fetched status of the server.
 
-        Closes the app with exit code 0 if the status is SHUTDOWN.
+        Closes the app with exit code 0 if the status is SHUTDOWN. Wishes are still
+        accepted if the server is unreachable, they wait in the outbox until it is back.
         """
         if status == ServerStatus.SHUTDOWN:
             sys.exit(0)
+        self._server_status = status
 
-        enabled = status == ServerStatus.OK
+        enabled = status in (ServerStatus.OK, ServerStatus.ERROR)
         self.view.music_wish_widget.setEnabled(enabled)
         self.view.send_button.setEnabled(enabled)
         self.view.quick_select_button.setEnabled(enabled)
 
-        self.view.music_wish_widget.status_widget.setVisible(not enabled)
+        self.view.music_wish_widget.status_widget.setVisible(status != ServerStatus.OK)
         self.view.music_wish_widget.status_widget.setEnabled(True)
         self.view.music_wish_widget.status_widget.set_status(status)
 
@@ -182,7 +295,7 @@ class MusicController(Controller[MusicWishView]):
         Returns:
             the error text if a slur was found, else None
         """
-        for text in music_request.dict().values():
+        for text in music_request.model_dump().values():
 
             if text is None or not contains_slur(text):
                 continue
@@ -0,0 +1,263 @@
+import functools
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from PyQt6 import QtCore
+
+from disco_express.config import CONFIG
+from disco_express.models import JukeBoxConnectionError
+
+from .executor import RequestExecutor, get_request_executor
+
+
+class PollJob:
+    """A periodic server call managed by the PollScheduler.
+
+    Args:
+        name: the unique name of the job
+        interval: the interval in seconds between two polls while the server is reachable
+        func: the blocking function polling the server
+        on_result: called in the GUI thread with the return value of `func`
+        on_error: called in the GUI thread with the exception raised by `func`
+        probes_server: whether the outcome of a poll tells if the server is reachable
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Any],
+        on_result: Callable[[Any], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        probes_server: bool = True,
+    ):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.on_result = on_result
+        self.on_error = on_error
+        self.probes_server = probes_server
+
+        self.next_due = time.monotonic()
+        self.in_flight = False
+        # whether the job was triggered while it was being polled
+        self.triggered = False
+        self.paused = False
+        self.poll_times = deque()
+
+
+class PollScheduler(QtCore.QObject):
+    """Scheduler owning all periodic server calls.
+
+    Each job is polled at most once at a time. While the server is unreachable the
+    intervals of all jobs are doubled with every failed poll, up to `max_backoff`
+    seconds, and reset as soon as a poll succeeds again.
+
+    A paused job is not polled periodically, e.g. while the server pushes its
+    changes, but can still be triggered. A job triggered while it is being polled is
+    polled once more afterwards.
+
+    Args:
+        executor: the executor used to run the polls off the GUI thread
+        max_backoff: the maximum interval in seconds while the server is unreachable
+    """
+
+    RATE_WINDOW = 300  # in seconds
+    MAX_DOUBLINGS = 16
+
+    server_reachable_changed = QtCore.pyqtSignal(bool)
+
+    def __init__(self, executor: RequestExecutor, max_backoff: float = 60):
+        super().__init__()
+        self.executor = executor
+        self.max_backoff = max_backoff
+
+        self._jobs: dict[str, PollJob] = {}
+        self._failures = 0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._poll_due_jobs)
+
+        self._report_timer = QtCore.QTimer(self)
+        self._report_timer.setInterval(self.RATE_WINDOW * 1000)
+        self._report_timer.timeout.connect(self.log_poll_rates)
+        self._report_timer.start()
+
+    @property
+    def server_reachable(self) -> bool:
+        """Whether the last poll reached the server."""
+        return self._failures == 0
+
+    def register(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Any],
+        on_result: Callable[[Any], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        probes_server: bool = True,
+    ):
+        """Register a job which polls `func` every `interval` seconds.
+
+        The first poll is done right away. Registering a name twice replaces the
+        previous job instead of adding a second one. Jobs which do not always reach
+        the server should pass `probes_server=False`, so their outcome does not
+        change the backoff.
+        """
+        job = PollJob(
+            name,
+            interval,
+            func,
+            on_result=on_result,
+            on_error=on_error,
+            probes_server=probes_server,
+        )
+        if (previous := self._jobs.get(name)) is not None:
+            job.in_flight = previous.in_flight
+            job.triggered = previous.triggered
+            job.poll_times = previous.poll_times
+            job.paused = previous.paused
+        self._jobs[name] = job
+        self._schedule_next()
+
+    def set_interval(self, name: str, interval: float):
+        """Change the interval of the job `name` to `interval` seconds."""
+        job = self._jobs.get(name)
+        if job is None:
+            return
+        job.interval = interval
+        job.next_due = min(job.next_due, self._next_due(job, time.monotonic()))
+        self._schedule_next()
+
+    def set_paused(self, name: str, paused: bool):
+        """Stop or resume the periodic polls of the job `name`.
+
+        A resumed job is polled right away to catch up on missed changes.
+        """
+        job = self._jobs.get(name)
+        if job is None or job.paused == paused:
+            return
+        job.paused = paused
+        job.next_due = math.inf if paused else time.monotonic()
+        self._schedule_next()
+
+    def trigger(self, name: str):
+        """Poll the job `name` now, or once more as soon as its running poll finished."""
+        job = self._jobs.get(name)
+        if job is None:
+            return
+        if job.in_flight:
+            # the running poll may have missed the change the trigger is about
+            job.triggered = True
+            return
+        job.next_due = time.monotonic()
+        self._schedule_next()
+
+    def effective_interval(self, job: PollJob) -> float:
+        """Retrieve the interval of `job` including the backoff of failed polls."""
+        if self._failures == 0:
+            return job.interval
+        backoff = job.interval * 2 ** min(self._failures, self.MAX_DOUBLINGS)
+        return min(backoff, max(self.max_backoff, job.interval))
+
+    def poll_rates(self) -> dict[str, float]:
+        """Retrieve the effective polls per minute of each job over the last RATE_WINDOW seconds."""
+        now = time.monotonic()
+        rates = {}
+        for name, job in self._jobs.items():
+            while job.poll_times and job.poll_times[0] < now - self.RATE_WINDOW:
+                job.poll_times.popleft()
+            rates[name] = len(job.poll_times) * 60 / self.RATE_WINDOW
+        return rates
+
+    @QtCore.pyqtSlot()
+    def log_poll_rates(self):
+        """Log the effective poll rates of all jobs."""
+        rates = ", ".join(
+            f"{name}: {rate:.1f}/min" for name, rate in self.poll_rates().items()
+        )
+        logging.info(
+            "Poll rates (server reachable: %s): %s",
+            self.server_reachable,
+            rates,
+        )
+
+    def _next_due(self, job: PollJob, now: float) -> float:
+        return math.inf if job.paused else now + self.effective_interval(job)
+
+    def _schedule_next(self):
+        pending = [
+            job.next_due
+            for job in self._jobs.values()
+            if not job.in_flight and job.next_due < math.inf
+        ]
+        if not pending:
+            self._timer.stop()
+            return
+
+        delay = max(0.0, min(pending) - time.monotonic())
+        self._timer.start(int(delay * 1000))
+
+    @QtCore.pyqtSlot()
+    def _poll_due_jobs(self):
+        now = time.monotonic()
+        for job in self._jobs.values():
+            if job.in_flight or job.next_due > now:
+                continue
+
+            job.in_flight = True
+            job.poll_times.append(now)
+            self.executor.submit(
+                job.func,
+                on_result=functools.partial(self._on_poll_result, job.name),
+                on_error=functools.partial(self._on_poll_error, job.name),
+            )
+        self._schedule_next()
+
+    def _on_poll_result(self, name: str, result: Any):  # noqa: ANN401
+        if self._failures > 0 and self._jobs[name].probes_server:
+            logging.info("Server reachable again, resetting poll intervals")
+            self._failures = 0
+            now = time.monotonic()
+            for other in self._jobs.values():
+                other.next_due = min(other.next_due, self._next_due(other, now))
+            self.server_reachable_changed.emit(True)
+
+        job = self._finish_poll(name)
+        if job.on_result is not None:
+            job.on_result(result)
+
+    def _on_poll_error(self, name: str, exc: Exception):
+        if isinstance(exc, JukeBoxConnectionError) and self._jobs[name].probes_server:
+            self._failures += 1
+            if self._failures == 1:
+                self.server_reachable_changed.emit(False)
+
+        job = self._finish_poll(name)
+        if job.on_error is not None:
+            job.on_error(exc)
+        else:
+            logging.error("Error polling '%s'", name, exc_info=exc)
+
+    def _finish_poll(self, name: str) -> PollJob:
+        job = self._jobs[name]
+        job.in_flight = False
+        now = time.monotonic()
+        job.next_due = now if job.triggered else self._next_due(job, now)
+        job.triggered = False
+        self._schedule_next()
+        return job
+
+
+@functools.cache
+def get_poll_scheduler() -> PollScheduler:
+    """Retrieve the PollScheduler shared by all controllers."""
+    return PollScheduler(
+        get_request_executor(),
+        max_backoff=CONFIG.general.max_poll_backoff,
+    )
@@ -0,0 +1,91 @@
+import logging
+import threading
+
+from PyQt6 import QtCore
+
+from disco_express.models import (
+    JukeBoxClient,
+    JukeBoxConnectionError,
+    JukeBoxPushUnsupportedError,
+)
+
+
+class PushListener(QtCore.QThread):
+    """Thread listening on the push channel of the server.
+
+    The received events are emitted as signals, so they are handled in the GUI
+    thread. A dropped channel is reopened with exponential backoff. If the server
+    does not offer a push channel at all, the listener stops for good and the
+    changes are only discovered by polling.
+
+    Args:
+        client: the client used to open the push channel
+        read_timeout: the time in seconds after which a silent channel is dropped
+        max_backoff: the maximum delay in seconds between two attempts to reconnect
+    """
+
+    status_received = QtCore.pyqtSignal(object)
+    banner_received = QtCore.pyqtSignal(object)
+    documents_received = QtCore.pyqtSignal(list)
+    connected_changed = QtCore.pyqtSignal(bool)
+
+    def __init__(
+        self,
+        client: JukeBoxClient,
+        read_timeout: float = 30.0,
+        max_backoff: float = 60,
+    ):
+        super().__init__()
+        self.client = client
+        self.read_timeout = read_timeout
+        self.max_backoff = max_backoff
+
+        self._stopped = threading.Event()
+        self._response = None
+
+    def run(self):
+        """Listen on the push channel until `stop` is called."""
+        delay = 1
+        while not self._stopped.is_set():
+            connected = False
+            try:
+                self._response = self.client.open_events(self.read_timeout)
+                logging.info("Push channel opened")
+                connected = True
+                self.connected_changed.emit(True)
+                delay = 1
+                self._listen()
+            except JukeBoxPushUnsupportedError as exc:
+                logging.info("Server offers no push channel, polling instead: %s", exc)
+                return
+            except JukeBoxConnectionError as exc:
+                if connected:
+                    logging.info("Push channel closed: %s", exc)
+                else:
+                    logging.debug("Cannot open push channel: %s", exc)
+            except Exception:
+                # the polls take over until the channel is reopened
+                logging.exception("Push channel failed")
+            finally:
+                self._response = None
+                if connected:
+                    self.connected_changed.emit(False)
+
+            self._stopped.wait(delay)
+            delay = min(delay * 2, self.max_backoff)
+
+    def stop(self, timeout: int = 2000):
+        """Close the push channel and wait up to `timeout` ms for the thread to end."""
+        self._stopped.set()
+        if (response := self._response) is not None:
+            response.close()
+        self.wait(timeout)
+
+    def _listen(self):
+        for event, value in self.client.iter_events(self._response):
+            if event == "status":
+                self.status_received.emit(value)
+            elif event == "banner":
+                self.banner_received.emit(value)
+            elif event == "documents":
+                self.documents_received.emit(value)
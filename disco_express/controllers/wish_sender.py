@@ -0,0 +1,102 @@
+import logging
+
+from PyQt6 import QtCore
+
+from disco_express.models import (
+    JukeBoxClient,
+    JukeBoxConnectionError,
+    MusicRequest,
+    WishOutbox,
+)
+
+from .poll_scheduler import PollScheduler
+
+HTTP_SERVER_ERROR = 500
+
+
+class WishSender(QtCore.QObject):
+    """Background sender delivering the wishes stored in the WishOutbox.
+
+    Wishes are sent in the order they were entered. A wish which cannot be delivered
+    because of a connection or server error stays in the outbox and is retried with
+    exponential backoff, a wish the server rejects is not sent again and reported with
+    `wish_rejected`.
+
+    Args:
+        outbox: the outbox storing the wishes
+        client: the client used to send the wishes
+        scheduler: the scheduler running the deliveries in the background
+        interval: the interval in seconds in which the outbox is checked for due wishes
+    """
+
+    pending_changed = QtCore.pyqtSignal(int)
+    # the idempotency key of the delivered wish
+    wish_delivered = QtCore.pyqtSignal(str)
+    # the idempotency key of the rejected wish and the error of the server
+    wish_rejected = QtCore.pyqtSignal(str, str)
+
+    def __init__(
+        self,
+        outbox: WishOutbox,
+        client: JukeBoxClient,
+        scheduler: PollScheduler,
+        interval: float = 2,
+    ):
+        super().__init__()
+        self.outbox = outbox
+        self.client = client
+        self.scheduler = scheduler
+
+        self.scheduler.register(
+            "outbox",
+            interval,
+            self.flush,
+            on_result=self.pending_changed.emit,
+            on_error=self._on_flush_error,
+            probes_server=False,
+        )
+
+    def add(self, music_request: MusicRequest) -> str:
+        """Store `music_request` in the outbox and send it as soon as possible.
+
+        Returns:
+            the idempotency key of the wish
+        """
+        key = self.outbox.add(music_request)
+        self.pending_changed.emit(self.outbox.count())
+        self.scheduler.trigger("outbox")
+        return key
+
+    def flush(self) -> int:
+        """Method to send all due wishes, runs off the GUI thread.
+
+        Returns:
+            the amount of wishes still waiting to be sent.
+        """
+        for entry in self.outbox.due():
+            if entry.attempts > 0:
+                self.client.metrics.record_retry("POST", "/music_wish/")
+            try:
+                err = self.client.send_music_request(
+                    entry.music_request,
+                    idempotency_key=entry.key,
+                )
+            except JukeBoxConnectionError as exc:
+                # the server is unreachable, the remaining wishes would fail as well
+                self.outbox.mark_failed(entry.key, str(exc))
+                raise
+
+            if err is None:
+                self.outbox.mark_sent(entry.key)
+                self.wish_delivered.emit(entry.key)
+            elif err.status >= HTTP_SERVER_ERROR:
+                self.outbox.mark_failed(entry.key, err.error)
+            else:
+                logging.warning("Music wish %s rejected: %s", entry.key, err.error)
+                self.outbox.mark_rejected(entry.key, err.error)
+                self.wish_rejected.emit(entry.key, err.error)
+        return self.outbox.count()
+
+    def _on_flush_error(self, exc: Exception):
+        logging.warning("Cannot send queued music wishes: %s", exc)
+        self.pending_changed.emit(self.outbox.count())
@@ -1,7 +1,16 @@
 from .charts_manager import ChartsManager
+from .circuit_breaker import BreakerState, CircuitBreaker
+from .document_sync import DocumentSync
+from .fuzzy_index import FuzzyIndex, get_fuzzy_index
 from .jukebox_client import (
     JukeBoxClient,
     JukeBoxConnectionError,
     JukeBoxError,
+    JukeBoxPushUnsupportedError,
     MusicRequest,
 )
+from .metrics import ClientMetrics
+from .prefix_index import PrefixIndex, get_prefix_index
+from .rate_limiter import RateLimiter
+from .song_index import SongIndex, get_song_index, song_key
+from .wish_outbox import OutboxEntry, WishOutbox, WishState
@@ -1,51 +1,165 @@
-import os
+import itertools
+import logging
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Container
+from typing import TYPE_CHECKING
 
-import pandas as pd
+from disco_express.config.models import ChartsMode, Song
 
-from disco_express.config.models import Song
+from .play_buckets import PlayBuckets
+from .play_log import HEADER, PlayLog
+from .ranking import Ranking
+from .song_index import SongIndex, SongKey
 
-HEADER = ["Title", "Artist", "Plays"]
+if TYPE_CHECKING:
+    import pandas as pd
+
+# the amount of logged plays after which they are compacted into the charts file
+COMPACT_THRESHOLD = 200
+# the duration in seconds of the time buckets recent plays are counted in
+BUCKET_DURATION = 15 * 60
+# the amount of half-lives after which decayed plays are dropped
+HALF_LIVES_KEPT = 8
+# the amount of half-lives after which decayed scores are rebased to the present
+REBASE_HALF_LIVES = 256
+
+
+def current_bucket() -> int:
+    """Function to retrieve the number of the current time bucket."""
+    return int(time.time() // BUCKET_DURATION)
 
 
 class ChartsManager:
     """A manager managing charts with their respective plays and sorting them accordingly.
 
+    The plays are counted in memory and kept ranked as they change. Each added play
+    is appended to the play log of the charts file and compacted into the charts
+    file in the background, so adding a song and reading the top of the charts cost
+    the same no matter how large the charts grow.
+
+    Depending on `mode` songs are ranked by all their plays, by their plays in the
+    last `window_hours`, or by their plays halving in weight every `half_life_hours`.
+    The latter two are computed from the recent plays of each song counted in a
+    ring buffer of time buckets. Decayed scores are stored relative to a fixed base
+    bucket, so the ranking only changes when songs are played, not as time passes.
+
     Args:
         charts_file: the file the charts should be saved/loaded from.
         charts_threshold: the minimum amount of plays needed to be in the charts.
+        index: the index identifying the songs, a private one if None
+        mode: how the plays of a song are ranked
+        window_hours: the time window of the plays ranked in the WINDOW mode
+        half_life_hours: the half-life of the plays ranked in the DECAY mode
     """
 
-    def __init__(self, charts_file: str, charts_threshold: int = 0):
+    def __init__(
+        self,
+        charts_file: str,
+        charts_threshold: int = 0,
+        index: SongIndex | None = None,
+        mode: ChartsMode = ChartsMode.ALL_TIME,
+        window_hours: float = 6.0,
+        half_life_hours: float = 2.0,
+    ):
         self.charts_file = charts_file
         self.charts_threshold = charts_threshold
+        self.index = index if index is not None else SongIndex()
+        self.mode = mode
 
-        if os.path.isfile(self.charts_file):
-            self.charts = self.load_charts()
-        else:
-            self.charts = pd.DataFrame(columns=HEADER)
+        retention = {
+            ChartsMode.ALL_TIME: 0,
+            ChartsMode.WINDOW: window_hours * 3600,
+            ChartsMode.DECAY: half_life_hours * 3600 * HALF_LIVES_KEPT,
+        }[mode]
+        self.play_log = PlayLog(charts_file, retention=retention)
 
-    def get_charts_list(self) -> list[Song]:
-        """Method to retrieve the chars as a list of Songs."""
-        charts = self.charts[self.charts["Plays"] >= self.charts_threshold].sort_values(
-            "Plays",
-            ascending=False,
-        )
+        self._ranking = Ranking()
+        self._plays: Counter[SongKey] = Counter()
+        self._buckets: dict[SongKey, PlayBuckets] = {}
+        self._bucket_count = max(1, math.ceil(retention / BUCKET_DURATION))
+        # the songs played in each bucket, to rescore them once it expires
+        self._played: defaultdict[int, set[SongKey]] = defaultdict(set)
+        self._half_life = half_life_hours * 3600 / BUCKET_DURATION  # in buckets
+        self._now = self._base = current_bucket()
+        self._lock = threading.Lock()
+        self._compaction: threading.Thread | None = None
+
+        self.load_charts()
+
+    def get_charts_list(self, limit: int | None = None, offset: int = 0) -> list[Song]:
+        """Method to retrieve the charts as a list of Songs, most played first.
 
-        out = []
-        for _, chart in charts.iterrows():
-            out.append(
-                Song(
-                    title=chart["Title"],
-                    artist=chart["Artist"],
-                    plays=chart["Plays"],
-                ),
-            )
+        Args:
+            limit: the maximum amount of songs, all if None
+            offset: the amount of most played songs to skip
+        """
+        with self._lock:
+            self._advance()
+            scale = self._scale()
+            return [
+                self.index.get(key).model_copy(update={"plays": round(score * scale)})
+                for key, score in self._ranking.top(
+                    limit,
+                    offset,
+                    minimum=self.charts_threshold / scale,
+                )
+            ]
 
-        return out
+    def __len__(self) -> int:
+        """Retrieve the amount of songs in the charts."""
+        with self._lock:
+            self._advance()
+            return self._ranking.count_at_least(self.charts_threshold / self._scale())
 
-    def load_charts(self) -> pd.DataFrame:
-        """Method to load the charts' database."""
-        return pd.read_csv(self.charts_file, sep=";", header=0)
+    def retain_songs(self, keys: Container[SongKey]) -> int:
+        """Method to remove the songs neither in `keys` nor ever played from the index.
+
+        Returns:
+            the amount of removed songs
+        """
+        with self._lock:
+            return self.index.retain(lambda key: key in keys or key in self._plays)
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """Method to export the all-time plays as DataFrame for analyses.
+
+        Requires pandas, which is installed with `poetry install --with analytics`.
+        """
+        import pandas as pd
+
+        with self._lock:
+            rows = self._rows()
+        return pd.DataFrame(rows, columns=HEADER)
+
+    def load_charts(self):
+        """Method to load the charts' database and the plays logged since."""
+        with self._lock:
+            self._wait_for_compaction()
+            self._ranking.reset(self._load())
+
+    def reload(self) -> bool:
+        """Method to reload the charts' database if it was replaced, e.g. by a sync.
+
+        Only the songs whose plays changed are moved in the ranking. Plays logged
+        since the last compaction are kept on top of the new database.
+
+        Returns:
+            True if any song's plays changed.
+        """
+        with self._lock:
+            self._wait_for_compaction()
+            if not self.play_log.snapshot_changed():
+                return False
+            changed = self._ranking.update(self._load())
+        logging.info(
+            "Reloaded charts '%s', %s songs changed",
+            self.charts_file,
+            changed,
+        )
+        return changed > 0
 
     def add_song(self, song: Song):
         """Method to add a song into the charts' database.
@@ -53,17 +167,118 @@ class ChartsManager:
         Args:
             song: the song to add
         """
-        titles = [title.strip().lower() for title in self.charts["Title"].values]
-
-        if song.title.strip().lower() in titles:
-            self.charts.loc[
-                (self.charts["Title"].str.contains(song.title, case=False))
-                & (self.charts["Artist"].str.contains(song.artist, case=False)),
-                "Plays",
-            ] += 1
-        else:
-            data = {"Title": song.title, "Artist": song.artist, "Plays": 1}
-            new_row = pd.DataFrame(data, columns=data.keys(), index=[0])
-            self.charts = pd.concat([self.charts, new_row], ignore_index=True)
+        with self._lock:
+            record = self.play_log.append(song.title, song.artist)
+            key = self.index.add(song.title, song.artist)
+            self._plays[key] += 1
+            if self.mode is ChartsMode.ALL_TIME:
+                self._ranking.set(key, self._plays[key])
+            else:
+                self._advance()
+                self._count_play(key, record.time)
+                self._rescore(key)
+
+        if self.play_log.pending >= COMPACT_THRESHOLD:
+            self.compact_in_background()
+
+    def compact_in_background(self):
+        """Method to compact the play log into the charts file in a background thread."""
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+
+        with self._lock:
+            rows = self._rows()
+            seq = self.play_log.seq
+
+            def compact():
+                try:
+                    self.play_log.compact(rows, seq)
+                except OSError:
+                    logging.exception(
+                        "Could not compact the charts '%s'",
+                        self.charts_file,
+                    )
+
+            self._compaction = threading.Thread(target=compact, daemon=True)
+            self._compaction.start()
+
+    def _wait_for_compaction(self):
+        if self._compaction is not None:
+            self._compaction.join()
+
+    def _rows(self) -> list[tuple[str, str, int]]:
+        return [
+            (song.title, song.artist, plays)
+            for key, plays in self._plays.most_common()
+            if (song := self.index.get(key)) is not None
+        ]
 
-        self.charts.to_csv(self.charts_file, sep=";", index=False)
+    def _load(self) -> dict[SongKey, float]:
+        rows, pending, retained = self.play_log.load()
+        self._plays = Counter()
+        for title, artist, plays in rows:
+            self._plays[self.index.add(title, artist)] += plays
+        for record in pending:
+            self._plays[self.index.add(record.title, record.artist)] += 1
+        if self.mode is ChartsMode.ALL_TIME:
+            return self._plays
+
+        self._now = current_bucket()
+        self._buckets = {}
+        self._played = defaultdict(set)
+        for record in itertools.chain(retained, pending):
+            self._count_play(self.index.add(record.title, record.artist), record.time)
+        return self._scores()
+
+    def _scale(self) -> float:
+        # the factor converting the stored scores into plays at the present
+        if self.mode is ChartsMode.DECAY:
+            return 2 ** ((self._base - self._now) / self._half_life)
+        return 1.0
+
+    def _advance(self):
+        now = current_bucket()
+        if self.mode is ChartsMode.ALL_TIME or now <= self._now:
+            return
+        self._now = now
+
+        expired = [
+            bucket for bucket in self._played if bucket <= now - self._bucket_count
+        ]
+        keys = set().union(*(self._played.pop(bucket) for bucket in expired))
+        if self._now - self._base > REBASE_HALF_LIVES * self._half_life:
+            self._base = self._now
+            self._ranking.reset(self._scores())
+            return
+        for key in keys:
+            self._rescore(key)
+
+    def _count_play(self, key: SongKey, played: float):
+        bucket = int(played // BUCKET_DURATION)
+        if (buckets := self._buckets.get(key)) is None:
+            buckets = self._buckets[key] = PlayBuckets(self._bucket_count)
+        if buckets.add(bucket):
+            self._played[bucket].add(key)
+
+    def _score(self, buckets: PlayBuckets) -> float:
+        if self.mode is ChartsMode.WINDOW:
+            return buckets.total(self._now)
+        return sum(
+            count * 2 ** ((bucket - self._base) / self._half_life)
+            for bucket, count in buckets.items(self._now)
+        )
+
+    def _scores(self) -> dict[SongKey, float]:
+        scores = {key: self._score(buckets) for key, buckets in self._buckets.items()}
+        for key in [key for key, score in scores.items() if score <= 0]:
+            del scores[key], self._buckets[key]
+        return scores
+
+    def _rescore(self, key: SongKey):
+        buckets = self._buckets.get(key)
+        score = self._score(buckets) if buckets is not None else 0
+        if score > 0:
+            self._ranking.set(key, score)
+        else:
+            self._ranking.remove(key)
+            self._buckets.pop(key, None)
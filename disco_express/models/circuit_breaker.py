@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from enum import Enum
+
+
+class BreakerState(Enum):
+    """All states of a CircuitBreaker."""
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitBreaker:
+    """Circuit breaker letting calls to an unreachable server fail fast.
+
+    The breaker is closed as long as the server is reachable. After
+    `failure_threshold` consecutive failed attempts it opens and rejects all calls
+    right away. Once `reset_timeout` seconds passed, it is half-open and lets a single
+    probe through, whose outcome closes the breaker again or reopens it.
+
+    Args:
+        failure_threshold: the amount of consecutive failures opening the breaker
+        reset_timeout: the time in seconds the breaker stays open before probing
+        on_state_change: called with the new state whenever the state changes, from
+            the thread which caused the change.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 10.0,
+        on_state_change: Callable[[BreakerState], None] | None = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_state_change = on_state_change
+
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._changed = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> BreakerState:
+        """The current state of the breaker."""
+        return self._state
+
+    def allow(self) -> bool:
+        """Check whether a call may be attempted now.
+
+        While half-open only a single probe is let through. A probe which never
+        reported back is replaced after another `reset_timeout` seconds.
+        """
+        with self._lock:
+            if self._state == BreakerState.CLOSED:
+                return True
+            if time.monotonic() - self._changed < self.reset_timeout:
+                return False
+            previous = self._state
+            self._set_state(BreakerState.HALF_OPEN)
+        if previous == BreakerState.OPEN:
+            self._notify(BreakerState.HALF_OPEN)
+        return True
+
+    def record_success(self):
+        """Report a call which reached the server."""
+        with self._lock:
+            self._failures = 0
+            if self._state == BreakerState.CLOSED:
+                return
+            self._set_state(BreakerState.CLOSED)
+        logging.info("Server reachable again, closing circuit breaker")
+        self._notify(BreakerState.CLOSED)
+
+    def record_failure(self):
+        """Report a call which could not reach the server."""
+        with self._lock:
+            self._failures += 1
+            if self._state == BreakerState.OPEN or (
+                self._state == BreakerState.CLOSED
+                and self._failures < self.failure_threshold
+            ):
+                return
+            self._set_state(BreakerState.OPEN)
+        logging.warning(
+            "Server unreachable, failing fast for %s seconds",
+            self.reset_timeout,
+        )
+        self._notify(BreakerState.OPEN)
+
+    def _set_state(self, state: BreakerState):
+        self._state = state
+        self._changed = time.monotonic()
+
+    def _notify(self, state: BreakerState):
+        if self.on_state_change is not None:
+            self.on_state_change(state)
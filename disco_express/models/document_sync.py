@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from pydantic import BaseModel
+
+from .jukebox_client import (
+    IF_RANGE_SUFFIX,
+    PART_SUFFIX,
+    JukeBoxClient,
+    JukeBoxConnectionError,
+)
+from .rate_limiter import RateLimiter
+
+
+class DocumentEntry(BaseModel):
+    """The Schema of a locally stored document in the manifest."""
+
+    name: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    validators: dict[str, str] = {}
+
+
+def hash_file(path: str) -> str:
+    """Function to compute the sha256 hex digest of the file at `path`."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(2**16):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DocumentSync:
+    """Class keeping a local documents directory in sync with the server.
+
+    Instead of downloading all documents again with every sync, a manifest of name,
+    size and hash of all local documents is kept in the directory. Every listed
+    document is revalidated with a conditional request, so only new or changed
+    documents are downloaded, and only removed documents are deleted. Downloads
+    replace the previous version of a document atomically.
+
+    Documents are downloaded by a bounded pool of threads. A document which fails to
+    download does not abort the others, it is retried with the next sync.
+
+    Args:
+        client: the client used to retrieve the documents
+        docs_dir: the directory where the documents are stored
+        progress: called with the document name, the bytes received so far and the
+            total size in bytes (None if unknown) while a document is downloaded.
+        max_concurrency: the maximum amount of documents downloaded at the same time
+        rate_limiter: limits the bandwidth shared by all downloads
+    """
+
+    MANIFEST_FILE = ".manifest.json"
+
+    def __init__(
+        self,
+        client: JukeBoxClient,
+        docs_dir: str,
+        progress: Callable[[str, int, int | None], None] | None = None,
+        max_concurrency: int = 1,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        self.client = client
+        self.docs_dir = docs_dir
+        self.progress = progress
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.manifest_path = os.path.join(docs_dir, self.MANIFEST_FILE)
+
+    def load_manifest(self) -> dict[str, DocumentEntry]:
+        """Method to load the manifest, dropping entries which do not match the disk."""
+        try:
+            with open(self.manifest_path) as file:
+                entries = [DocumentEntry(**entry) for entry in json.load(file)]
+        except (OSError, ValueError):
+            return {}
+
+        return {entry.name: entry for entry in entries if self._is_unchanged(entry)}
+
+    def save_manifest(self, manifest: dict[str, DocumentEntry]):
+        """Method to atomically write the `manifest` to the documents directory."""
+        part_path = f"{self.manifest_path}.part"
+        with open(part_path, "w") as file:
+            json.dump([entry.model_dump() for entry in manifest.values()], file)
+        os.replace(part_path, self.manifest_path)
+
+    def sync(self) -> bool:
+        """Method to bring the local documents in line with the server.
+
+        Returns:
+            whether any local document was added, changed or removed.
+        """
+        documents = self.client.list_documents()
+        os.makedirs(self.docs_dir, exist_ok=True)
+        manifest = self.load_manifest()
+        changed = self._remove_stale(documents, manifest)
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            futures = {
+                pool.submit(self._sync_document, doc, manifest.get(doc)): doc
+                for doc in documents
+            }
+            for future in as_completed(futures):
+                doc = futures[future]
+                try:
+                    entry, doc_changed = future.result()
+                except (JukeBoxConnectionError, OSError) as exc:
+                    logging.warning("Could not sync document '%s': %s", doc, exc)
+                    failed.append(doc)
+                    continue
+
+                manifest[doc] = entry
+                changed |= doc_changed
+        self.save_manifest(manifest)
+
+        if failed:
+            logging.warning(
+                "%s of %s documents failed to sync, retrying with the next sync",
+                len(failed),
+                len(documents),
+            )
+        return changed
+
+    def _sync_document(
+        self,
+        doc: str,
+        previous: DocumentEntry | None,
+    ) -> tuple[DocumentEntry, bool]:
+        path = self.client.get_document(
+            doc,
+            self.docs_dir,
+            validators=previous.validators if previous is not None else None,
+            progress=self.progress,
+            rate_limiter=self.rate_limiter,
+        )
+        if previous is not None and self._is_unchanged(previous):
+            return previous, False
+
+        entry = self._build_entry(doc, path)
+        changed = previous is None or previous.sha256 != entry.sha256
+        if changed:
+            logging.info("Document '%s' was added or changed", doc)
+        return entry, changed
+
+    def _remove_stale(
+        self,
+        documents: list[str],
+        manifest: dict[str, DocumentEntry],
+    ) -> bool:
+        removed = False
+        for name in os.listdir(self.docs_dir):
+            path = os.path.join(self.docs_dir, name)
+            part_name = name.removesuffix(IF_RANGE_SUFFIX)
+            if part_name.startswith(".") and part_name.endswith(PART_SUFFIX):
+                # the partial download of a document which was removed meanwhile
+                if part_name[1 : -len(PART_SUFFIX)] not in documents:
+                    logging.info("Removing partial download '%s'", name)
+                    os.remove(path)
+                continue
+            if name in documents or name.startswith(".") or not os.path.isfile(path):
+                continue
+
+            logging.info("Removing document '%s'", name)
+            os.remove(path)
+            manifest.pop(name, None)
+            removed = True
+
+        for name in set(manifest) - set(documents):
+            manifest.pop(name)
+        return removed
+
+    def _build_entry(self, doc: str, path: str) -> DocumentEntry:
+        stat = os.stat(path)
+        return DocumentEntry(
+            name=doc,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=hash_file(path),
+            validators=self.client.get_document_validators(doc),
+        )
+
+    def _is_unchanged(self, entry: DocumentEntry) -> bool:
+        try:
+            stat = os.stat(os.path.join(self.docs_dir, entry.name))
+        except OSError:
+            return False
+        return stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns
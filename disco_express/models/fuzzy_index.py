@@ -0,0 +1,187 @@
+import array
+import functools
+import heapq
+import threading
+from collections import Counter
+
+from disco_express.config.models import Song
+
+from .song_index import SongIndex, get_song_index, normalize
+
+
+def trigrams(word: str) -> set[str]:
+    """Function to split `word` into its trigrams.
+
+    The word is only padded at the start, so a prefix of a word shares all its
+    trigrams with the word.
+    """
+    padded = f"  {word}"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def max_typos(word: str) -> int:
+    """Function to retrieve how many typos are tolerated in the query word `word`."""
+    return len(word) // 4
+
+
+def edit_distance(query: str, word: str, limit: int, *, prefix: bool = False) -> int:
+    """Function to calculate the Levenshtein distance between `query` and `word`.
+
+    Args:
+        query: the typed word
+        word: the word to compare with
+        limit: the distance from which the exact distance is irrelevant, the
+            calculation stops early and returns `limit` + 1 once it is exceeded
+        prefix: whether to compare with the closest prefix of `word` instead, as
+            `query` is still being typed
+    """
+    if word.startswith(query) if prefix else word == query:
+        return 0
+    if len(query) - len(word) > limit or (
+        not prefix and len(word) - len(query) > limit
+    ):
+        return limit + 1
+
+    previous = list(range(len(word) + 1))
+    for i, char in enumerate(query, 1):
+        current = [i]
+        for j, other in enumerate(word, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char != other),
+                ),
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(min(previous) if prefix else previous[-1], limit + 1)
+
+
+class FuzzyIndex:
+    """Typo tolerant search over the titles and artists of the songs of a SongIndex.
+
+    Every distinct word of the titles and artists is split into trigrams, which map
+    to the words containing them. A query word is compared by edit distance only with
+    the words sharing enough of its trigrams, the last query word as a prefix while
+    it is being typed. A song matches if each query word matches one of its words.
+
+    The matches of each word of the last query are kept, so a keystroke only looks up
+    the word being typed. Songs added to the SongIndex are indexed on the next search
+    or `update`, the index is built anew once songs were removed from the SongIndex.
+
+    Args:
+        songs: the songs to search
+    """
+
+    def __init__(self, songs: SongIndex):
+        self.songs = songs
+        self._lock = threading.RLock()
+        self._reset()
+
+    def search(self, query: str, limit: int = 30) -> list[Song]:
+        """Retrieve up to `limit` songs matching `query`, best matches first.
+
+        A song matches if every word of `query` is at most `max_typos` edits away
+        from a word of its title or artist. Songs are ranked by their total amount of
+        edits, then in the order they became known, the classics and current charts
+        first.
+        """
+        words = normalize(query).split()
+        if not words:
+            return []
+        # the last word is complete once a space was typed after it
+        typing = not query[-1].isspace()
+
+        with self._lock:
+            self.update()
+            matches = {}
+            for position, word in enumerate(words):
+                key = (word, typing and position == len(words) - 1)
+                matches[key] = (
+                    self._matches[key] if key in self._matches else self._match(*key)
+                )
+            self._matches = matches
+
+            per_word = sorted(matches.values(), key=len)
+            typos = per_word[0]
+            for word_typos in per_word[1:]:
+                typos = {
+                    song_id: song_typos + word_typos[song_id]
+                    for song_id, song_typos in typos.items()
+                    if song_id in word_typos
+                }
+            best = heapq.nsmallest(
+                limit,
+                typos,
+                key=lambda song_id: (typos[song_id], song_id),
+            )
+            return [self._songs[song_id] for song_id in best]
+
+    def update(self):
+        """Index the songs added to the SongIndex since the last update."""
+        with self._lock:
+            if self._generation != self.songs.generation:
+                self._reset()
+            new = self.songs.added_since(len(self._songs))
+            if not new:
+                return
+            for song in new:
+                song_id = len(self._songs)
+                self._songs.append(song)
+                for word in set(normalize(f"{song.title} {song.artist}").split()):
+                    if word not in self._word_ids:
+                        self._add_word(word)
+                    self._word_songs[self._word_ids[word]].append(song_id)
+            # the matches of the last query are missing the new songs
+            self._matches = {}
+
+    def __len__(self) -> int:
+        """Retrieve the amount of indexed songs."""
+        return len(self._songs)
+
+    def _reset(self):
+        self._generation = self.songs.generation
+        self._songs: list[Song] = []
+        self._words: list[str] = []
+        self._word_ids: dict[str, int] = {}
+        self._word_songs: list[array.array] = []
+        self._postings: dict[str, array.array] = {}
+        self._matches: dict[tuple[str, bool], dict[int, int]] = {}
+
+    def _add_word(self, word: str):
+        word_id = len(self._words)
+        self._words.append(word)
+        self._word_ids[word] = word_id
+        self._word_songs.append(array.array("l"))
+        for gram in trigrams(word):
+            self._postings.setdefault(gram, array.array("l")).append(word_id)
+
+    def _match(self, word: str, prefix: bool) -> dict[int, int]:
+        # the songs with a word matching `word`, with the least amount of typos
+        limit = max_typos(word)
+        grams = trigrams(word)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        # a typo changes at most three trigrams, words sharing less cannot match
+        minimum = max(len(grams) - 3 * limit, 1)
+
+        song_typos = {}
+        for word_id, count in shared.items():
+            if count < minimum:
+                continue
+            typos = edit_distance(word, self._words[word_id], limit, prefix=prefix)
+            if typos > limit:
+                continue
+            for song_id in self._word_songs[word_id]:
+                if typos < song_typos.get(song_id, limit + 1):
+                    song_typos[song_id] = typos
+        return song_typos
+
+
+@functools.cache
+def get_fuzzy_index() -> FuzzyIndex:
+    """Get the index searching the songs of the shared SongIndex."""
+    return FuzzyIndex(get_song_index())
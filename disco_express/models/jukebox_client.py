@@ -1,16 +1,31 @@
+import contextlib
 import logging
 import os.path
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
 from enum import Enum
-from typing import Any
+from typing import Any, TypeVar
 
 import requests
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from requests.adapters import HTTPAdapter
+
+from disco_express.config.models import NetworkConfig
+
+from .circuit_breaker import BreakerState, CircuitBreaker
+from .metrics import ClientMetrics
+from .rate_limiter import RateLimiter
 
 
 class JukeBoxConnectionError(Exception):
     """Error indicating the Jukebox Server cannot be reached."""
 
 
+class JukeBoxPushUnsupportedError(Exception):
+    """Error indicating the Jukebox Server does not offer a push channel."""
+
+
 class ServerStatus(Enum):
     """All available server status."""
 
@@ -44,7 +59,35 @@ class BannerSchema(BaseModel):
     english: str
 
 
+class StatusSchema(BaseModel):
+    """The Schema of the status retrieved from the server."""
+
+    status: ServerStatus
+
+
+class ErrorSchema(BaseModel):
+    """The Schema of the error bodies sent by the server."""
+
+    error: str | None = None
+    detail: Any = None
+
+
+DOCUMENT_LIST = TypeAdapter(list[str])
+
+
 HTTP_OK_RANGE = 200, 299
+HTTP_PARTIAL_CONTENT = 206
+HTTP_NOT_MODIFIED = 304
+HTTP_RANGE_NOT_SATISFIABLE = 416
+# answers of a server which does not know the push channel
+HTTP_PUSH_UNSUPPORTED = 404, 405, 501
+
+# the suffix of the hidden file a document is downloaded to
+PART_SUFFIX = ".part"
+# the suffix of the file next to a ".part" file keeping its If-Range validator
+IF_RANGE_SUFFIX = ".if-range"
+
+T = TypeVar("T")
 
 
 def status_ok(status: int) -> bool:
@@ -52,111 +95,717 @@ def status_ok(status: int) -> bool:
     return HTTP_OK_RANGE[0] <= status <= HTTP_OK_RANGE[1]
 
 
-class JukeBoxClient:
-    """Class handling the communication with the DiscoExpress Server.
+def get_validators(response: requests.Response) -> dict[str, str]:
+    """Function to build the headers for a conditional request from the validators of a `response`."""
+    validators = {}
+    if etag := response.headers.get("ETag"):
+        validators["If-None-Match"] = etag
+    if last_modified := response.headers.get("Last-Modified"):
+        validators["If-Modified-Since"] = last_modified
+    return validators
+
+
+def parse_error(response: requests.Response) -> str:
+    """Function to extract the error message from the body of an error `response`."""
+    try:
+        body = ErrorSchema.model_validate_json(response.content)
+    except ValidationError:
+        return response.text or response.reason
+    if body.error is not None:
+        return body.error
+    if body.detail is not None:
+        return str(body.detail)
+    return response.text or response.reason
+
+
+class ServerEndpoint:
+    """A server the JukeBoxClient can send its requests to.
 
     Args:
         address: the ip/domain address of the server
         port: the port the server is running on
+        breaker: the circuit breaker skipping the server while it is unreachable
     """
 
-    def __init__(self, address: str, port: int):
+    LATENCY_SMOOTHING = 0.3
+
+    def __init__(self, address: str, port: int, breaker: CircuitBreaker):
         self.address = address
         self.port = port
+        self.breaker = breaker
+        # smoothed latency of the health probes in seconds, None if unknown
+        self.latency: float | None = None
+
+    def __str__(self) -> str:
+        """Format the server as address:port."""
+        return f"{self.address}:{self.port}"
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the last health probe reached the server."""
+        return self.latency is not None and self.breaker.state == BreakerState.CLOSED
+
+    def url(self, uri: str) -> str:
+        """Build the url of `uri` on this server."""
+        return f"http://{self.address}:{self.port}/{uri.removeprefix('/')}"
+
+    def record_latency(self, seconds: float | None):
+        """Update the smoothed latency with a probe, None if the probe failed."""
+        if seconds is None or self.latency is None:
+            self.latency = seconds
+            return
+        self.latency += self.LATENCY_SMOOTHING * (seconds - self.latency)
+
+
+class JukeBoxClient:
+    """Class handling the communication with the DiscoExpress Server.
+
+    All requests are sent through one pooled keep-alive session, so connections to
+    the server are reused instead of being opened for every request. The push
+    channel holds its connection as long as it is open, so it has a session of its
+    own and does not take a connection from the pool.
+
+    Polled resources are requested conditionally with the validators (ETag and
+    Last-Modified) of their last response. If the server answers with
+    304 Not Modified, the previously parsed value is returned without reading a body.
+
+    All requests pass a circuit breaker. While the server is unreachable, requests
+    fail right away with a JukeBoxConnectionError instead of waiting for the connect
+    timeout, until a single probe request reaches the server again.
+
+    Standby servers can be given in addition to the server. Each server has its own
+    circuit breaker. A request which cannot reach the current server is sent to the
+    next one right away, and `probe_servers` switches to the healthy server with the
+    lowest latency.
+
+    Latency, errors, bytes and retries of all requests are recorded per endpoint in
+    `metrics`.
+
+    Args:
+        address: the ip/domain address of the server
+        port: the port the server is running on
+        pool_size: the maximum amount of connections kept open to the server
+        download_concurrency: the amount of documents downloaded at the same time,
+            the pool keeps a connection for each of them in addition to `pool_size`
+        connect_timeout: the timeout in seconds for establishing a connection
+        read_timeout: the timeout in seconds for waiting on the server's response
+        failure_threshold: the amount of consecutive connection failures after which
+            requests fail fast
+        reset_timeout: the time in seconds requests fail fast before the server is
+            probed again
+        standby_servers: address and port of the servers used if the server fails
+    """
+
+    CHUNK_SIZE = 2**16
+    DOWNLOAD_ATTEMPTS = 3
+    # a healthy server replaces the current one only if it is clearly faster
+    SWITCH_LATENCY_RATIO = 0.7
+
+    def __init__(
+        self,
+        address: str,
+        port: int,
+        pool_size: int = 4,
+        download_concurrency: int = 0,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+        failure_threshold: int = 3,
+        reset_timeout: float = 10.0,
+        standby_servers: Sequence[tuple[str, int]] = (),
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        # open while no server at all is reachable
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.servers = [
+            ServerEndpoint(
+                server_address,
+                server_port,
+                CircuitBreaker(failure_threshold, reset_timeout),
+            )
+            for server_address, server_port in [(address, port), *standby_servers]
+        ]
+        self._current = self.servers[0]
+        self._server_lock = threading.Lock()
+        self.metrics = ClientMetrics()
+        # uri -> (validators, parsed value) of the last full response
+        self._conditional_cache: dict[str, tuple[dict[str, str], Any]] = {}
+
+        self.session = self._build_session(pool_size + download_concurrency)
+        self.events_session = self._build_session(1)
+
+    @classmethod
+    def from_config(
+        cls: type["JukeBoxClient"],
+        network: NetworkConfig,
+    ) -> "JukeBoxClient":
+        """Build a client from the network section of the config.toml."""
+        return cls(
+            network.server_ip,
+            network.server_port,
+            pool_size=network.pool_size,
+            download_concurrency=network.max_download_concurrency,
+            connect_timeout=network.connect_timeout,
+            read_timeout=network.read_timeout,
+            failure_threshold=network.breaker_failure_threshold,
+            reset_timeout=network.breaker_reset_timeout,
+            standby_servers=[
+                (server.ip, server.port) for server in network.standby_servers
+            ],
+        )
+
+    @property
+    def current_server(self) -> ServerEndpoint:
+        """The server requests are sent to first."""
+        return self._current
+
+    @property
+    def address(self) -> str:
+        """The ip/domain address of the current server."""
+        return self._current.address
+
+    @property
+    def port(self) -> int:
+        """The port of the current server."""
+        return self._current.port
+
+    def close(self):
+        """Close all pooled connections to the server."""
+        self.session.close()
+        self.events_session.close()
+
+    def probe_servers(self) -> ServerEndpoint:
+        """Check the latency of all servers and switch to the fastest healthy one.
+
+        Returns:
+            the server requests are sent to from now on
+        """
+        for server in self.servers:
+            started = time.perf_counter()
+            try:
+                response = self.session.get(
+                    server.url("/status/"),
+                    timeout=self.timeout,
+                )
+                response.close()
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as exc:
+                logging.debug("Probing server %s failed: %s", server, exc)
+                server.breaker.record_failure()
+                server.record_latency(None)
+                continue
+            server.breaker.record_success()
+            server.record_latency(time.perf_counter() - started)
+
+        healthy = [server for server in self.servers if server.healthy]
+        if not healthy:
+            return self._current
+
+        self.breaker.record_success()
+        fastest = min(healthy, key=lambda server: server.latency)
+        current = self._current
+        if (
+            not current.healthy
+            or fastest.latency < current.latency * self.SWITCH_LATENCY_RATIO
+        ):
+            self._use(fastest)
+        return self._current
 
     def request(
         self,
         method: str,
         uri: str,
-        data: dict[str, Any] or None = None,
+        data: BaseModel | None = None,
+        headers: dict[str, str] | None = None,
+        stream: bool = False,
+        timeout: tuple[float, float] | None = None,
+        session: requests.Session | None = None,
     ) -> tuple[requests.Response | None, JukeBoxError | None]:
         """Method to make a proper request to the disco_express_server.
 
         Args:
             method: the request method used
             uri: the uri to which the request should be made
-            data: additional adata which should be sent in the body
+            data: the model which should be sent as JSON body
+            headers: additional headers which should be sent
+            stream: whether the body should be streamed instead of read at once
+            timeout: the connect and read timeout, defaults to the client's timeout
+            session: the session sending the request, defaults to the pooled session
 
         Returns:
             The response from the server or None if an error occurred.
         """
-        uri = f"http://{self.address}:{self.port}/{uri if not uri.startswith('/') else uri[1:]}"
+        if not self.breaker.allow():
+            self.metrics.record_error(method, uri, "CircuitOpen")
+            raise JukeBoxConnectionError(f"Server unreachable, not sending to {uri}")
 
-        headers = {"Content-Type": "application/json"}
         logging.debug("Sending to %s this data: %s", uri, data)
+        body = data.model_dump_json().encode() if data is not None else None
+        exc = None
+        for server in self._candidates():
+            if exc is not None:
+                logging.warning("Failing over to server %s: %s", server, exc)
+                self.metrics.record_retry(method, uri)
+
+            url = server.url(uri)
+            started = time.perf_counter()
+            try:
+                response = (session or self.session).request(
+                    method,
+                    url,
+                    data=body,
+                    headers=headers,
+                    timeout=timeout or self.timeout,
+                    # the body is read below, so a failure while reading it is mapped
+                    stream=True,
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as error:
+                server.breaker.record_failure()
+                self.metrics.record_request(
+                    method,
+                    url,
+                    time.perf_counter() - started,
+                    error=type(error).__name__,
+                )
+                exc = error
+                continue
+
+            server.breaker.record_success()
+            self.breaker.record_success()
+            self._use(server)
+            break
+        else:
+            self.breaker.record_failure()
+            raise JukeBoxConnectionError(str(exc)) from exc
+
+        ok = (
+            status_ok(response.status_code) or response.status_code == HTTP_NOT_MODIFIED
+        )
+        bytes_sent = len(response.request.body or b"")
         try:
-            response = requests.request(
+            # a streamed body is read by the caller, unless the request failed
+            bytes_received = 0 if stream and ok else len(response.content)
+        except requests.exceptions.RequestException as exc:
+            self.metrics.record_request(
                 method,
-                uri,
-                json=data,
-                headers=headers,
-                timeout=10,
+                url,
+                time.perf_counter() - started,
+                error=type(exc).__name__,
+                bytes_sent=bytes_sent,
             )
-        except requests.exceptions.ConnectionError as exc:
             raise JukeBoxConnectionError(str(exc)) from exc
-        if status_ok(response.status_code):
+
+        self.metrics.record_request(
+            method,
+            url,
+            time.perf_counter() - started,
+            error=None if ok else f"HTTP {response.status_code}",
+            bytes_sent=bytes_sent,
+            bytes_received=bytes_received,
+        )
+        if ok:
             return response, None
 
-        body = response.json()
-        logging.debug("Request unsuccessful: (%s) %s", response.status_code, body)
-        error_msg = body.get("error", body.get("detail", str(body)))
-        return None, JukeBoxError(status=response.status_code, error=error_msg)
+        err = JukeBoxError(status=response.status_code, error=parse_error(response))
+        logging.debug("Request unsuccessful: (%s) %s", err.status, err.error)
+        return None, err
+
+    def _build_session(self, pool_size: int) -> requests.Session:
+        session = requests.Session()
+        session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(
+            pool_connections=len(self.servers),
+            pool_maxsize=pool_size,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _candidates(self) -> Iterator[ServerEndpoint]:
+        current = self._current
+        standby = sorted(
+            (server for server in self.servers if server is not current),
+            key=lambda server: (server.latency is None, server.latency or 0),
+        )
+        tried = False
+        for server in [current, *standby]:
+            if server.breaker.allow():
+                tried = True
+                yield server
+        if not tried:
+            # the client's breaker let this request through as probe
+            yield current
+
+    def _use(self, server: ServerEndpoint):
+        with self._server_lock:
+            if server is self._current:
+                return
+            logging.info("Switching from server %s to %s", self._current, server)
+            self._current = server
+
+    def send_music_request(
+        self,
+        music_request: MusicRequest,
+        idempotency_key: str | None = None,
+    ) -> None | JukeBoxError:
+        """Send a `music_request` to the server.
+
+        Args:
+            music_request: the wish which should be sent
+            idempotency_key: a unique key of the wish, allowing the server to ignore
+                the wish if it is delivered more than once.
+
+        Returns:
+            the error of the server if it did not accept the wish, else None
 
-    def send_music_request(self, music_request: MusicRequest) -> None | JukeBoxError:
-        """Send a `music_request` to the server."""
+        Raises:
+            JukeBoxConnectionError: if the server cannot be reached.
+        """
         logging.info("Requesting Music: %s", music_request)
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+        _, err = self.request(
+            "POST",
+            "/music_wish/",
+            data=music_request,
+            headers=headers,
+        )
+        return err
+
+    def conditional_get(self, uri: str, parse: Callable[[bytes], T]) -> T:
+        """Retrieve `uri` with a conditional GET request.
+
+        Args:
+            uri: the uri which should be retrieved
+            parse: validates the JSON body of a full response into the returned value
+
+        Returns:
+            the parsed value of the response, or the value of the last full response
+            if the server reports the resource as not modified.
+
+        Raises:
+            JukeBoxConnectionError: if the server answers with an error or a body
+                which does not match the schema.
+        """
+        validators, value = self._conditional_cache.get(uri, ({}, None))
+        response, err = self.request("GET", uri, headers=validators)
+        if err is not None:
+            raise JukeBoxConnectionError(str(err))
+
+        if response.status_code == HTTP_NOT_MODIFIED and validators:
+            logging.debug("'%s' not modified", uri)
+            return value
+
         try:
-            response, err = self.request(
-                "POST",
-                "/music_wish/",
-                data=music_request.dict(),
+            value = parse(response.content)
+        except ValidationError as exc:
+            err = JukeBoxError(
+                status=response.status_code,
+                error=f"Invalid response from '{uri}': {exc}",
             )
-            if err is not None:
-                return err
-        except requests.exceptions.ConnectionError as exc:
-            raise JukeBoxConnectionError(str(exc)) from exc
+            raise JukeBoxConnectionError(str(err)) from exc
+        if validators := get_validators(response):
+            self._conditional_cache[uri] = (validators, value)
+        else:
+            self._conditional_cache.pop(uri, None)
+        return value
 
     def get_status(self) -> ServerStatus:
         """Retrieve the current status from the server."""
-        response, err = self.request("GET", "/status/")
-        if err is not None:
-            raise JukeBoxConnectionError(str(err))
-        body = response.json()
-        return ServerStatus(body["status"])
+        return self.conditional_get(
+            "/status/",
+            lambda body: StatusSchema.model_validate_json(body).status,
+        )
 
     def list_documents(self) -> list[str]:
         """Retrieve a list of all available documents from the server."""
-        response, err = self.request("GET", "/documents/")
-        if err is not None:
-            raise JukeBoxConnectionError(str(err))
-        return response.json()
+        return self.conditional_get("/documents/", DOCUMENT_LIST.validate_json)
 
-    def get_document(self, doc_name: str, save_dir: str) -> str:
+    def get_document(
+        self,
+        doc_name: str,
+        save_dir: str,
+        validators: dict[str, str] | None = None,
+        progress: Callable[[str, int, int | None], None] | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> str:
         """Retrieve a specific document from the server.
 
+        The document is streamed in chunks to a hidden ".part" file, which replaces the
+        saved document once it is complete. Interrupted downloads are resumed with
+        HTTP range requests instead of starting over, also by a later run of the app,
+        as the If-Range validator is kept next to the ".part" file.
+
         Args:
             doc_name: the document name which should be retrieved
             save_dir: the directory where the document should be saved.
+            validators: the validators of an already saved copy of the document,
+                used if the client did not retrieve the document itself yet.
+            progress: called with the document name, the bytes received so far and
+                the total size in bytes (None if unknown) after every chunk.
+            rate_limiter: limits the bandwidth used for the download
 
         Returns:
             the path to the saved document
         """
-        response, err = self.request("GET", f"/documents/{doc_name}")
+        uri = f"/documents/{doc_name}"
+        save_path = os.path.join(save_dir, doc_name)
+        part_path = os.path.join(save_dir, f".{doc_name}{PART_SUFFIX}")
+        if_range_path = f"{part_path}{IF_RANGE_SUFFIX}"
+        if not os.path.isfile(save_path):
+            # the validators only apply to the local copy of the document
+            self._conditional_cache.pop(uri, None)
+        elif validators and uri not in self._conditional_cache:
+            self._conditional_cache[uri] = (validators, save_path)
+
+        for attempt in range(1, self.DOWNLOAD_ATTEMPTS + 1):
+            validators, _ = self._conditional_cache.get(uri, ({}, None))
+            headers = {**validators, "Accept-Encoding": "identity"}
+            if_range = _read_if_range(if_range_path)
+            if if_range is not None and os.path.isfile(part_path):
+                headers["Range"] = f"bytes={os.path.getsize(part_path)}-"
+                headers["If-Range"] = if_range
+
+            try:
+                response, err = self._download(
+                    uri,
+                    doc_name,
+                    headers,
+                    part_path,
+                    progress,
+                    rate_limiter,
+                )
+            except JukeBoxConnectionError:
+                # only connection errors and interrupted streams are worth a retry
+                resumable = os.path.isfile(if_range_path) or "Range" in headers
+                if attempt == self.DOWNLOAD_ATTEMPTS or not resumable:
+                    raise
+                logging.warning(
+                    "Download of '%s' interrupted, resuming (attempt %s)",
+                    doc_name,
+                    attempt + 1,
+                )
+                self.metrics.record_retry("GET", uri)
+                continue
+
+            if err is not None:
+                if err.status != HTTP_RANGE_NOT_SATISFIABLE or "Range" not in headers:
+                    raise JukeBoxConnectionError(str(err))
+                # the partial download does not match the document anymore, start over
+                _remove_file(if_range_path)
+                continue
+
+            if response.status_code == HTTP_NOT_MODIFIED:
+                logging.debug("'%s' not modified", uri)
+                return save_path
+
+            os.replace(part_path, save_path)
+            _remove_file(if_range_path)
+            if validators := get_validators(response):
+                self._conditional_cache[uri] = (validators, save_path)
+            else:
+                self._conditional_cache.pop(uri, None)
+            logging.info("Downloaded '%s' successfully.", doc_name)
+            return save_path
+
+        raise JukeBoxConnectionError(f"Could not download '{doc_name}'")
+
+    def _download(
+        self,
+        uri: str,
+        doc_name: str,
+        headers: dict[str, str],
+        part_path: str,
+        progress: Callable[[str, int, int | None], None] | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> tuple[requests.Response | None, JukeBoxError | None]:
+        response, err = self.request("GET", uri, headers=headers, stream=True)
         if err is not None:
-            raise JukeBoxConnectionError(str(err))
+            return None, err
 
-        # Save the file to local disk
-        save_path = os.path.join(save_dir, doc_name)
-        with open(save_path, "wb") as file:
-            file.write(response.content)
-        logging.info("Downloaded '%s' successfully.", doc_name)
-        return save_path
+        if response.status_code == HTTP_NOT_MODIFIED:
+            response.close()
+        else:
+            self._save_stream(
+                response,
+                uri,
+                doc_name,
+                part_path,
+                progress,
+                rate_limiter,
+            )
+        return response, None
+
+    def _save_stream(
+        self,
+        response: requests.Response,
+        uri: str,
+        doc_name: str,
+        part_path: str,
+        progress: Callable[[str, int, int | None], None] | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        resumed = response.status_code == HTTP_PARTIAL_CONTENT
+        offset = os.path.getsize(part_path) if resumed else 0
+
+        length = response.headers.get("Content-Length")
+        total = offset + int(length) if length is not None else None
+
+        # remember a strong validator, so an interrupted download can be resumed
+        etag = response.headers.get("ETag", "")
+        if_range = etag if etag and not etag.startswith("W/") else None
+        if_range = if_range or response.headers.get("Last-Modified")
+        if_range_path = f"{part_path}{IF_RANGE_SUFFIX}"
+        if if_range is not None:
+            with open(if_range_path, "w") as file:
+                file.write(if_range)
+        else:
+            _remove_file(if_range_path)
+
+        received = offset
+        try:
+            with open(part_path, "ab" if resumed else "wb") as file:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    file.write(chunk)
+                    received += len(chunk)
+                    self.metrics.record_bytes_received("GET", uri, len(chunk))
+                    if rate_limiter is not None:
+                        rate_limiter.consume(len(chunk))
+                    if progress is not None:
+                        progress(doc_name, received, total)
+        except requests.exceptions.RequestException as exc:
+            self.metrics.record_error("GET", uri, type(exc).__name__)
+            raise JukeBoxConnectionError(str(exc)) from exc
+        finally:
+            response.close()
+
+        if total is not None and received < total:
+            raise JukeBoxConnectionError(
+                f"Download of '{doc_name}' incomplete: {received}/{total} bytes",
+            )
+
+    def get_document_validators(self, doc_name: str) -> dict[str, str]:
+        """Retrieve the validators of the last downloaded version of `doc_name`."""
+        validators, _ = self._conditional_cache.get(
+            f"/documents/{doc_name}",
+            ({}, None),
+        )
+        return validators
 
     def get_banner_texts(self) -> BannerSchema:
         """Retrieve the banner texts from the server."""
-        response, err = self.request("GET", "/banner/")
+        return self.conditional_get(
+            "/banner/",
+            BannerSchema.model_validate_json,
+        )
+
+    def open_events(self, read_timeout: float = 30.0) -> requests.Response:
+        """Open the push channel of the server, a stream of Server-Sent Events.
+
+        The server is expected to send the current state of all resources right after
+        the channel was opened, and a comment as keep-alive well within `read_timeout`.
+
+        Args:
+            read_timeout: the time in seconds after which a silent channel is dropped
+
+        Raises:
+            JukeBoxPushUnsupportedError: if the server does not offer a push channel
+            JukeBoxConnectionError: if the server cannot be reached
+        """
+        response, err = self.request(
+            "GET",
+            "/events/",
+            headers={"Accept": "text/event-stream", "Accept-Encoding": "identity"},
+            stream=True,
+            timeout=(self.timeout[0], read_timeout),
+            session=self.events_session,
+        )
+        if err is not None and err.status in HTTP_PUSH_UNSUPPORTED:
+            raise JukeBoxPushUnsupportedError(str(err))
         if err is not None:
             raise JukeBoxConnectionError(str(err))
 
-        body = response.json()
-        return BannerSchema(**body)
+        content_type = response.headers.get("Content-Type", "")
+        if not content_type.startswith("text/event-stream"):
+            response.close()
+            raise JukeBoxPushUnsupportedError(
+                f"Unexpected Content-Type: {content_type}",
+            )
+        return response
+
+    def iter_events(self, response: requests.Response) -> Iterator[tuple[str, Any]]:
+        """Parse the events of a push channel opened with `open_events`.
+
+        Yields:
+            the name and the parsed value of each event, which is one of
+            ("status", ServerStatus), ("banner", BannerSchema) or
+            ("documents", list[str]). Unknown or malformed events are skipped.
+
+        Raises:
+            JukeBoxConnectionError: if the channel was interrupted
+        """
+        event, data = "message", []
+        try:
+            for line in self._iter_lines(response):
+                if line.startswith(":"):
+                    continue
+                if line:
+                    field, _, value = line.partition(":")
+                    value = value.removeprefix(" ")
+                    if field == "event":
+                        event = value
+                    elif field == "data":
+                        data.append(value)
+                    continue
+
+                if data and (parsed := self._parse_event(event, "\n".join(data))):
+                    yield parsed
+                event, data = "message", []
+        except requests.exceptions.RequestException as exc:
+            raise JukeBoxConnectionError(str(exc)) from exc
+        finally:
+            response.close()
+        raise JukeBoxConnectionError("Push channel closed by the server")
+
+    @staticmethod
+    def _iter_lines(response: requests.Response) -> Iterator[str]:
+        # read byte by byte, larger chunks would block until they are filled
+        line = bytearray()
+        for byte in response.iter_content(chunk_size=1):
+            if byte == b"\n":
+                yield line.decode("utf-8", errors="replace").removesuffix("\r")
+                line.clear()
+            else:
+                line += byte
+
+    @staticmethod
+    def _parse_event(event: str, data: str) -> tuple[str, Any] | None:
+        try:
+            if event == "status":
+                return event, StatusSchema.model_validate_json(data).status
+            if event == "banner":
+                return event, BannerSchema.model_validate_json(data)
+            if event == "documents":
+                return event, DOCUMENT_LIST.validate_json(data)
+        except ValidationError as exc:
+            logging.warning("Malformed '%s' event: %s", event, exc)
+            return None
+
+        logging.debug("Ignoring unknown event '%s'", event)
+        return None
+
+
+def _read_if_range(path: str) -> str | None:
+    try:
+        with open(path) as file:
+            return file.read() or None
+    except OSError:
+        return None
+
+
+def _remove_file(path: str):
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
@@ -0,0 +1,172 @@
+import bisect
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any
+from urllib.parse import urlsplit
+
+# upper bounds of the latency buckets in milliseconds
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, math.inf)
+PERCENTILES = (50, 90, 99)
+
+
+def endpoint_of(uri: str) -> str:
+    """Function to map a request `uri` to its endpoint, e.g. /documents/a.pdf to /documents/{name}."""
+    path = urlsplit(uri).path
+    return re.sub(r"^/documents/.+$", "/documents/{name}", path)
+
+
+class LatencyHistogram:
+    """Histogram counting latencies in the fixed LATENCY_BUCKETS."""
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, millis: float):
+        """Count a latency of `millis` milliseconds."""
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, millis)] += 1
+        self.count += 1
+        self.total += millis
+        self.min = min(self.min, millis)
+        self.max = max(self.max, millis)
+
+    def percentile(self, percent: float) -> float | None:
+        """Estimate the `percent` percentile as the upper bound of its bucket."""
+        if self.count == 0:
+            return None
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts, strict=True):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the histogram into a JSON serializable dict."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else None,
+            "min_ms": self.min if self.count else None,
+            "max_ms": self.max if self.count else None,
+            **{f"p{percent}_ms": self.percentile(percent) for percent in PERCENTILES},
+            "buckets": {
+                f"<={bound}": count
+                for bound, count in zip(LATENCY_BUCKETS, self.counts, strict=True)
+                if count
+            },
+        }
+
+
+class EndpointMetrics:
+    """All metrics recorded for one method and endpoint."""
+
+    def __init__(self):
+        self.requests = 0
+        self.latency = LatencyHistogram()
+        self.errors = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the metrics into a JSON serializable dict."""
+        return {
+            "requests": self.requests,
+            "latency": self.latency.to_dict(),
+            "errors": dict(self.errors),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "retries": self.retries,
+        }
+
+
+class ClientMetrics:
+    """Thread safe collection of the metrics of all requests to the server.
+
+    Metrics are kept per method and endpoint, e.g. "GET /status/". The latency of a
+    request is the time until its response was received, or until the headers were
+    received for streamed responses.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._endpoints: dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record_request(
+        self,
+        method: str,
+        uri: str,
+        seconds: float,
+        error: str | None = None,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ):
+        """Record a finished request.
+
+        Args:
+            method: the request method used
+            uri: the uri of the request
+            seconds: the time the request took
+            error: the kind of error if the request failed
+            bytes_sent: the size of the request body
+            bytes_received: the size of the response body
+        """
+        with self._lock:
+            metrics = self._get(method, uri)
+            metrics.requests += 1
+            metrics.latency.add(seconds * 1000)
+            metrics.bytes_sent += bytes_sent
+            metrics.bytes_received += bytes_received
+            if error is not None:
+                metrics.errors[error] += 1
+
+    def record_error(self, method: str, uri: str, error: str):
+        """Record an error which occurred without a request being sent or finished."""
+        with self._lock:
+            self._get(method, uri).errors[error] += 1
+
+    def record_bytes_received(self, method: str, uri: str, amount: int):
+        """Record `amount` bytes received from a streamed response."""
+        with self._lock:
+            self._get(method, uri).bytes_received += amount
+
+    def record_retry(self, method: str, uri: str):
+        """Record a retry of a previously failed request."""
+        with self._lock:
+            self._get(method, uri).retries += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Retrieve the current metrics of all endpoints as JSON serializable dict."""
+        with self._lock:
+            return {
+                "started": self.started,
+                "created": time.time(),
+                "endpoints": {
+                    key: metrics.to_dict()
+                    for key, metrics in sorted(self._endpoints.items())
+                },
+            }
+
+    def dump(self, path: str):
+        """Atomically write a snapshot of the metrics as JSON to `path`."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        part_path = f"{path}.part"
+        with open(part_path, "w") as file:
+            json.dump(self.snapshot(), file, indent=2)
+        os.replace(part_path, path)
+
+    def _get(self, method: str, uri: str) -> EndpointMetrics:
+        key = f"{method} {endpoint_of(uri)}"
+        if (metrics := self._endpoints.get(key)) is None:
+            metrics = self._endpoints[key] = EndpointMetrics()
+        return metrics
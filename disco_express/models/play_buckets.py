@@ -0,0 +1,46 @@
+from collections.abc import Iterator
+
+
+class PlayBuckets:
+    """Ring buffer counting the plays of a song in consecutive time buckets.
+
+    Buckets are numbered by their start time divided by the bucket duration. Only the
+    `size` newest buckets are kept, older plays are dropped as time moves on.
+
+    Args:
+        size: the amount of buckets kept
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.counts = [0] * size
+        self.newest: int | None = None
+
+    def add(self, bucket: int, count: int = 1) -> bool:
+        """Count `count` plays in `bucket`, False if the bucket is too old to be kept."""
+        if self.newest is None or bucket > self.newest:
+            self._advance(bucket)
+        elif bucket <= self.newest - self.size:
+            return False
+        self.counts[bucket % self.size] += count
+        return True
+
+    def items(self, now: int) -> Iterator[tuple[int, int]]:
+        """Iterate over the buckets with plays kept at bucket `now` and their plays."""
+        if self.newest is None:
+            return
+        for bucket in range(max(self.newest, now) - self.size + 1, self.newest + 1):
+            if count := self.counts[bucket % self.size]:
+                yield bucket, count
+
+    def total(self, now: int) -> int:
+        """Retrieve the amount of plays kept at bucket `now`."""
+        return sum(count for _, count in self.items(now))
+
+    def _advance(self, bucket: int):
+        start = bucket - self.size + 1
+        if self.newest is not None:
+            start = max(start, self.newest + 1)
+        for expired in range(start, bucket + 1):
+            self.counts[expired % self.size] = 0
+        self.newest = bucket
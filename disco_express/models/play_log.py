@@ -0,0 +1,235 @@
+import csv
+import hashlib
+import io
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable
+
+from pydantic import BaseModel
+
+HEADER = ["Title", "Artist", "Plays"]
+
+
+class PlayRecord(BaseModel):
+    """A single play of a song in the play log."""
+
+    seq: int
+    time: float
+    title: str
+    artist: str
+    # the play is part of the snapshot and only kept for its time
+    compacted: bool = False
+
+
+class PlayLog:
+    """Durable append-only log of song plays on top of a CSV snapshot.
+
+    The snapshot `charts_file` holds the total plays of each song as
+    "Title;Artist;Plays". Instead of rewriting it for every play, each play is
+    appended as one small JSON line to `<charts_file>.log` and synced to disk.
+
+    `compact` folds the plays into a new snapshot. Before the snapshot is replaced, the
+    log records which plays the new snapshot contains, so a compaction interrupted at
+    any point neither loses nor double counts plays. Plays logged on top of a snapshot
+    which was replaced by someone else, e.g. synced from another kiosk, are kept.
+    An existing charts file without log is simply used as the first snapshot.
+
+    Compacted plays younger than `retention` stay in the log marked as compacted, so
+    the times of recent plays are known after a restart.
+
+    Args:
+        charts_file: the path of the CSV snapshot
+        retention: the time in seconds compacted plays are kept in the log
+    """
+
+    def __init__(self, charts_file: str, retention: float = 0):
+        self.charts_file = charts_file
+        self.log_file = f"{charts_file}.log"
+        self.retention = retention
+
+        self._seq = 0
+        # the plays in the log which are not part of the snapshot yet
+        self._pending: list[PlayRecord] = []
+        # the recent plays which are part of the snapshot
+        self._retained: list[PlayRecord] = []
+        self._file = None
+        # the hash of the snapshot as last loaded or written
+        self._digest = None
+        self._lock = threading.Lock()
+
+    @property
+    def seq(self) -> int:
+        """The sequence number of the last logged play."""
+        return self._seq
+
+    @property
+    def pending(self) -> int:
+        """The amount of plays which were not compacted into the snapshot yet."""
+        return len(self._pending)
+
+    def load(
+        self,
+    ) -> tuple[list[tuple[str, str, int]], list[PlayRecord], list[PlayRecord]]:
+        """Load the snapshot and all plays logged on top of it.
+
+        Returns:
+            the title, artist and plays of each song in the snapshot, the plays
+            which are not part of the snapshot and the retained plays which are.
+        """
+        try:
+            with open(self.charts_file, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            data = None
+        rows = parse_snapshot(data) if data is not None else []
+        digest = hashlib.sha256(data).hexdigest() if data is not None else None
+
+        with self._lock:
+            self._digest = digest
+            records, compacted = self._read_log(digest)
+            self._pending = [
+                record
+                for record in records
+                if not record.compacted and record.seq > compacted
+            ]
+            self._retained = []
+            self._retain(
+                record
+                for record in records
+                if record.compacted or record.seq <= compacted
+            )
+            self._seq = max((record.seq for record in records), default=compacted)
+            if compacted or self._file is None:
+                # finish an interrupted compaction, so its plays are not replayed
+                self._rewrite_log()
+            return rows, list(self._pending), list(self._retained)
+
+    def append(self, title: str, artist: str) -> PlayRecord:
+        """Durably log a play of the song `title` by `artist`."""
+        with self._lock:
+            self._seq += 1
+            record = PlayRecord(
+                seq=self._seq,
+                time=time.time(),
+                title=title,
+                artist=artist,
+            )
+            self._write(record.model_dump())
+            self._pending.append(record)
+        return record
+
+    def compact(self, rows: list[tuple[str, str, int]], seq: int):
+        """Replace the snapshot by `rows` and drop the plays it contains from the log.
+
+        Args:
+            rows: the title, artist and plays of each song, including all plays up
+                to the sequence number `seq`.
+            seq: the sequence number of the last play contained in `rows`
+        """
+        data = render_snapshot(rows)
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._write({"compacted": seq, "snapshot": digest})
+
+        part_path = f"{self.charts_file}.part"
+        with open(part_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(part_path, self.charts_file)
+
+        with self._lock:
+            self._digest = digest
+            self._retain(record for record in self._pending if record.seq <= seq)
+            self._pending = [record for record in self._pending if record.seq > seq]
+            self._rewrite_log()
+        logging.info("Compacted %s plays into '%s'", seq, self.charts_file)
+
+    def snapshot_changed(self) -> bool:
+        """Check if the snapshot was replaced since it was last loaded or compacted."""
+        try:
+            with open(self.charts_file, "rb") as file:
+                digest = hashlib.sha256(file.read()).hexdigest()
+        except FileNotFoundError:
+            digest = None
+        return digest != self._digest
+
+    def close(self):
+        """Close the log file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _read_log(self, digest: str | None) -> tuple[list[PlayRecord], int]:
+        records = []
+        compacted = 0
+        try:
+            with open(self.log_file, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                        if "snapshot" in entry:
+                            if entry["snapshot"] == digest:
+                                compacted = max(compacted, entry["compacted"])
+                        elif "seq" in entry:
+                            records.append(PlayRecord(**entry))
+                    except (ValueError, KeyError, TypeError):
+                        # a line torn by a power loss
+                        logging.warning("Skipping malformed play log line: %r", line)
+        except FileNotFoundError:
+            pass
+        return records, compacted
+
+    def _rewrite_log(self):
+        if self._file is not None:
+            self._file.close()
+        part_path = f"{self.log_file}.part"
+        with open(part_path, "w", encoding="utf-8") as file:
+            for record in itertools.chain(self._retained, self._pending):
+                file.write(json.dumps(record.model_dump()) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(part_path, self.log_file)
+        self._file = open(self.log_file, "a", encoding="utf-8")  # noqa: SIM115
+
+    def _retain(self, records: Iterable[PlayRecord]):
+        horizon = time.time() - self.retention
+        self._retained = [
+            record.model_copy(update={"compacted": True})
+            for record in itertools.chain(self._retained, records)
+            if record.time >= horizon
+        ]
+
+    def _write(self, entry: dict):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+
+def parse_snapshot(data: bytes) -> list[tuple[str, str, int]]:
+    """Function to parse the rows of a "Title;Artist;Plays" CSV snapshot."""
+    reader = csv.reader(io.StringIO(data.decode("utf-8")), delimiter=";")
+    next(reader, None)  # Skip the header
+    rows = []
+    for row in reader:
+        if len(row) < len(HEADER):
+            continue
+        try:
+            rows.append((row[0], row[1], int(float(row[2]))))
+        except ValueError:
+            logging.warning("Skipping malformed charts row: %s", row)
+    return rows
+
+
+def render_snapshot(rows: list[tuple[str, str, int]]) -> bytes:
+    """Function to render `rows` as "Title;Artist;Plays" CSV snapshot."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";", lineterminator="\n")
+    writer.writerow(HEADER)
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
@@ -0,0 +1,148 @@
+import array
+import bisect
+import functools
+import threading
+
+from disco_express.config.models import Song
+
+from .song_index import SongIndex, get_song_index, normalize
+
+# the amount of new songs from which the arrays are sorted again instead of inserted
+RESORT_THRESHOLD = 64
+# the bits of an entry of the words array holding the offset of the word in the text
+OFFSET_BITS = 16
+
+
+class _SortedPrefixes:
+    """Sorted arrays of normalized texts, once as a whole and once per further word.
+
+    The arrays hold integers instead of strings to stay small: the id of the text,
+    with the offset of the word in the text in the lower bits.
+    """
+
+    def __init__(self):
+        self.texts: list[str] = []
+        self._starts = array.array("q")
+        self._words = array.array("q")
+
+    def add(self, text: str, *, insert: bool) -> int:
+        text_id = len(self.texts)
+        self.texts.append(text)
+        entries = [(self._starts, 0)] + [
+            (self._words, offset + 1)
+            for offset, char in enumerate(text[: (1 << OFFSET_BITS) - 1])
+            if char == " "
+        ]
+        for entries_array, offset in entries:
+            entry = text_id << OFFSET_BITS | offset
+            if insert:
+                position = bisect.bisect(entries_array, text[offset:], key=self._text)
+                entries_array.insert(position, entry)
+            else:
+                entries_array.append(entry)
+        return text_id
+
+    def sort(self):
+        self._starts = array.array("q", sorted(self._starts, key=self._text))
+        self._words = array.array("q", sorted(self._words, key=self._text))
+
+    def find(self, prefix: str, limit: int) -> list[int]:
+        # matches at the start of the text first, then matches of further words
+        found = {}
+        for entries_array in (self._starts, self._words):
+            index = bisect.bisect_left(entries_array, prefix, key=self._text)
+            while (
+                len(found) < limit
+                and index < len(entries_array)
+                and self._text(entries_array[index]).startswith(prefix)
+            ):
+                found.setdefault(entries_array[index] >> OFFSET_BITS)
+                index += 1
+        return list(found)
+
+    def _text(self, entry: int) -> str:
+        return self.texts[entry >> OFFSET_BITS][entry & (1 << OFFSET_BITS) - 1 :]
+
+
+class PrefixIndex:
+    """Index completing titles and artists of the songs of a SongIndex.
+
+    The normalized titles and artists are kept in sorted arrays and searched with a
+    binary search, so a lookup costs O(log n) regardless of the catalog size. Words
+    after the first are indexed as well, so "que" finds "Queen" and "Dancing Queen".
+    Songs added to the SongIndex are indexed on the next lookup or `update`, the
+    index is built anew once songs were removed from the SongIndex.
+
+    Args:
+        songs: the songs to complete
+    """
+
+    def __init__(self, songs: SongIndex):
+        self.songs = songs
+        self._lock = threading.RLock()
+        self._reset()
+
+    def titles(self, prefix: str, limit: int = 10) -> list[Song]:
+        """Retrieve up to `limit` songs whose title starts with `prefix`.
+
+        Titles starting with `prefix` come first, then titles with a further word
+        starting with it, each sorted alphabetically.
+        """
+        with self._lock:
+            self.update()
+            ids = self._titles.find(_key(prefix), limit)
+            return [self._title_songs[i] for i in ids]
+
+    def artists(self, prefix: str, limit: int = 10) -> list[str]:
+        """Retrieve up to `limit` distinct artists starting with `prefix`, see `titles`."""
+        with self._lock:
+            self.update()
+            ids = self._artists.find(_key(prefix), limit)
+            return [self._artist_names[i] for i in ids]
+
+    def update(self):
+        """Index the songs added to the SongIndex since the last update."""
+        with self._lock:
+            if self._generation != self.songs.generation:
+                self._reset()
+            new = self.songs.added_since(self._indexed)
+            if not new:
+                return
+            insert = len(new) < RESORT_THRESHOLD
+            for song in new:
+                self._titles.add(normalize(song.title), insert=insert)
+                self._title_songs.append(song)
+
+                artist = normalize(song.artist)
+                if artist not in self._artist_ids:
+                    self._artist_ids[artist] = self._artists.add(artist, insert=insert)
+                    self._artist_names.append(song.artist)
+            if not insert:
+                self._titles.sort()
+                self._artists.sort()
+            self._indexed += len(new)
+
+    def __len__(self) -> int:
+        """Retrieve the amount of indexed songs."""
+        return self._indexed
+
+    def _reset(self):
+        self._generation = self.songs.generation
+        self._indexed = 0
+        self._titles = _SortedPrefixes()
+        self._title_songs: list[Song] = []
+        self._artists = _SortedPrefixes()
+        self._artist_names: list[str] = []
+        self._artist_ids: dict[str, int] = {}
+
+
+def _key(prefix: str) -> str:
+    # keep a trailing space, so "dancing " does not find "Dancingqueen"
+    key = normalize(prefix)
+    return f"{key} " if key and prefix[-1].isspace() else key
+
+
+@functools.cache
+def get_prefix_index() -> PrefixIndex:
+    """Get the index completing the songs of the shared SongIndex."""
+    return PrefixIndex(get_song_index())
@@ -0,0 +1,84 @@
+import bisect
+from collections.abc import Hashable, Iterator, Mapping
+
+
+class Ranking:
+    """Ranking of keys by their score, kept in order as scores change.
+
+    The entries are kept as sorted list of (-score, key), so updating a score is a
+    binary search plus one move, and reading the top of the ranking needs no sort.
+    Keys with equal scores are ranked by the key. Not thread safe.
+    """
+
+    def __init__(self):
+        self._scores: dict[Hashable, float] = {}
+        self._entries: list[tuple[float, Hashable]] = []
+
+    def set(self, key: Hashable, score: float):
+        """Set the score of `key`, adding it to the ranking if unknown."""
+        old = self._scores.get(key)
+        if old == score:
+            return
+        if old is not None:
+            del self._entries[bisect.bisect_left(self._entries, (-old, key))]
+        self._scores[key] = score
+        bisect.insort(self._entries, (-score, key))
+
+    def remove(self, key: Hashable):
+        """Remove `key` from the ranking."""
+        if (old := self._scores.pop(key, None)) is not None:
+            del self._entries[bisect.bisect_left(self._entries, (-old, key))]
+
+    def score(self, key: Hashable) -> float | None:
+        """Retrieve the score of `key`, None if it is not ranked."""
+        return self._scores.get(key)
+
+    def count_at_least(self, minimum: float) -> int:
+        """Retrieve the amount of keys with a score of at least `minimum`."""
+        # every entry up to (-minimum, <anything>) has a score >= minimum
+        return bisect.bisect_right(self._entries, -minimum, key=lambda entry: entry[0])
+
+    def top(
+        self,
+        limit: int | None = None,
+        offset: int = 0,
+        minimum: float | None = None,
+    ) -> Iterator[tuple[Hashable, float]]:
+        """Iterate over the keys and scores from the highest score downwards.
+
+        Args:
+            limit: the maximum amount of keys, all if None
+            offset: the amount of highest ranked keys to skip
+            minimum: the minimum score of the keys, if any
+        """
+        end = len(self._entries) if minimum is None else self.count_at_least(minimum)
+        if limit is not None:
+            end = min(end, offset + limit)
+        for index in range(offset, end):
+            score, key = self._entries[index]
+            yield key, -score
+
+    def update(self, scores: Mapping[Hashable, float]) -> int:
+        """Change the ranking to `scores`, moving only the keys whose score changed.
+
+        Returns:
+            the amount of keys added, removed or moved.
+        """
+        changed = 0
+        for key in self._scores.keys() - scores.keys():
+            self.remove(key)
+            changed += 1
+        for key, score in scores.items():
+            if self._scores.get(key) != score:
+                self.set(key, score)
+                changed += 1
+        return changed
+
+    def reset(self, scores: Mapping[Hashable, float] | None = None):
+        """Replace the whole ranking by `scores` with a single sort."""
+        self._scores = dict(scores or {})
+        self._entries = sorted((-score, key) for key, score in self._scores.items())
+
+    def __len__(self) -> int:
+        """Retrieve the amount of ranked keys."""
+        return len(self._entries)
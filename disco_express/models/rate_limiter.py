@@ -0,0 +1,43 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket limiting the throughput shared by multiple threads.
+
+    Args:
+        rate: the maximum amount of bytes per second, 0 or less disables the limit
+        burst: the amount of bytes which may be consumed at once, defaults to `rate`
+    """
+
+    def __init__(self, rate: float, burst: float | None = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the throughput is limited at all."""
+        return self.rate > 0
+
+    def consume(self, amount: int):
+        """Block until `amount` bytes may be transferred without exceeding the rate."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            # going into debt makes the following callers wait as well
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
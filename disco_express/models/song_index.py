@@ -0,0 +1,101 @@
+import functools
+import itertools
+import threading
+import unicodedata
+from collections.abc import Callable, Iterable, Iterator
+
+from disco_express.config import get_classics_songs, get_current_charts_songs
+from disco_express.config.models import Song
+
+SongKey = tuple[str, str]
+
+
+def normalize(text: str) -> str:
+    """Function to normalize `text` for comparisons, ignoring case, width and spacing."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def song_key(title: str, artist: str) -> SongKey:
+    """Function to build the canonical key identifying the song `title` by `artist`."""
+    return normalize(title), normalize(artist)
+
+
+class SongIndex:
+    """Thread safe hash index of all known songs by their canonical key.
+
+    Every song is stored once, under the spelling it was first added with, so the
+    same song wished as "  dancing QUEEN" is found in O(1) as "Dancing Queen".
+
+    Songs are only removed with `retain`, which increases `generation`, so indexes
+    following `added_since` know to start over.
+
+    Args:
+        songs: the songs to index initially
+    """
+
+    def __init__(self, songs: Iterable[Song] = ()):
+        self._songs: dict[SongKey, Song] = {}
+        self._added: list[Song] = []
+        self._lock = threading.Lock()
+        self.generation = 0
+        for song in songs:
+            self.add(song.title, song.artist)
+
+    def add(self, title: str, artist: str) -> SongKey:
+        """Register the song `title` by `artist` if unknown and return its key."""
+        key = song_key(title, artist)
+        if key not in self._songs:
+            with self._lock:
+                if key not in self._songs:
+                    song = Song(title=title, artist=artist)
+                    self._songs[key] = song
+                    self._added.append(song)
+        return key
+
+    def retain(self, keep: Callable[[SongKey], bool]) -> int:
+        """Remove all songs whose key `keep` returns False for.
+
+        Returns:
+            the amount of removed songs
+        """
+        with self._lock:
+            removed = [key for key in self._songs if not keep(key)]
+            if not removed:
+                return 0
+            for key in removed:
+                del self._songs[key]
+            self._added = list(self._songs.values())
+            self.generation += 1
+        return len(removed)
+
+    def get(self, key: SongKey) -> Song | None:
+        """Retrieve the canonical song of `key`, None if it is unknown."""
+        return self._songs.get(key)
+
+    def find(self, title: str, artist: str) -> Song | None:
+        """Retrieve the canonical song of `title` by `artist`, None if it is unknown."""
+        return self._songs.get(song_key(title, artist))
+
+    def added_since(self, count: int) -> list[Song]:
+        """Retrieve the songs added after the first `count` songs, in order."""
+        return self._added[count:]
+
+    def __contains__(self, key: SongKey) -> bool:
+        """Check if a song with the key `key` is known."""
+        return key in self._songs
+
+    def __len__(self) -> int:
+        """Retrieve the amount of known songs."""
+        return len(self._songs)
+
+    def __iter__(self) -> Iterator[Song]:
+        """Iterate over all known songs."""
+        return iter(list(self._songs.values()))
+
+
+@functools.cache
+def get_song_index() -> SongIndex:
+    """Get the index shared by the charts, the classics and the current charts."""
+    return SongIndex(
+        itertools.chain(get_classics_songs(), get_current_charts_songs()),
+    )
@@ -0,0 +1,161 @@
+import sqlite3
+import threading
+import time
+import uuid
+from enum import Enum
+
+from pydantic import BaseModel
+
+from .jukebox_client import MusicRequest
+
+
+class WishState(Enum):
+    """All states a wish in the outbox can be in."""
+
+    PENDING = "PENDING"
+    SENT = "SENT"
+    REJECTED = "REJECTED"
+
+
+class OutboxEntry(BaseModel):
+    """A wish stored in the outbox."""
+
+    key: str
+    music_request: MusicRequest
+    attempts: int = 0
+
+
+class WishOutbox:
+    """Durable outbox storing music wishes until the server accepted them.
+
+    Each wish is written to a SQLite database in WAL mode as soon as it is entered,
+    so no wish is lost while the server is unreachable or the app restarts. Every
+    wish gets a unique key, which is sent along as idempotency key so the server
+    can detect a wish that is delivered twice.
+
+    Args:
+        db_file: the path to the SQLite database file
+        max_retry_delay: the maximum delay in seconds between two delivery attempts
+        keep_sent: how long in seconds delivered wishes are kept in the database
+    """
+
+    def __init__(
+        self,
+        db_file: str,
+        max_retry_delay: float = 60,
+        keep_sent: float = 24 * 60 * 60,
+    ):
+        self.db_file = db_file
+        self.max_retry_delay = max_retry_delay
+        self.keep_sent = keep_sent
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_file, check_same_thread=False)
+        with self._lock, self._connection as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS wishes (
+                    key TEXT PRIMARY KEY,
+                    music_request TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    last_error TEXT
+                )
+                """,
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS wishes_due ON wishes (state, next_attempt)",
+            )
+
+    def close(self):
+        """Close the connection to the database."""
+        with self._lock:
+            self._connection.close()
+
+    def add(self, music_request: MusicRequest) -> str:
+        """Store `music_request` for delivery and return its idempotency key."""
+        key = str(uuid.uuid4())
+        now = time.time()
+        with self._lock, self._connection as connection:
+            connection.execute(
+                "INSERT INTO wishes (key, music_request, state, next_attempt, created, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    music_request.model_dump_json(),
+                    WishState.PENDING.value,
+                    now,
+                    now,
+                    now,
+                ),
+            )
+        return key
+
+    def due(self, limit: int = 10) -> list[OutboxEntry]:
+        """Retrieve up to `limit` pending wishes whose next delivery attempt is due."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, music_request, attempts FROM wishes"
+                " WHERE state = ? AND next_attempt <= ? ORDER BY created LIMIT ?",
+                (WishState.PENDING.value, time.time(), limit),
+            ).fetchall()
+
+        return [
+            OutboxEntry(
+                key=key,
+                music_request=MusicRequest.model_validate_json(music_request),
+                attempts=attempts,
+            )
+            for key, music_request, attempts in rows
+        ]
+
+    def count(self, state: WishState = WishState.PENDING) -> int:
+        """Retrieve the amount of wishes in `state`."""
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM wishes WHERE state = ?",
+                (state.value,),
+            ).fetchone()
+        return count
+
+    def mark_sent(self, key: str):
+        """Mark the wish `key` as delivered and drop old delivered wishes."""
+        now = time.time()
+        with self._lock, self._connection as connection:
+            connection.execute(
+                "UPDATE wishes SET state = ?, updated = ? WHERE key = ?",
+                (WishState.SENT.value, now, key),
+            )
+            connection.execute(
+                "DELETE FROM wishes WHERE state = ? AND updated < ?",
+                (WishState.SENT.value, now - self.keep_sent),
+            )
+
+    def mark_rejected(self, key: str, error: str):
+        """Mark the wish `key` as rejected by the server, it won't be sent again."""
+        with self._lock, self._connection as connection:
+            connection.execute(
+                "UPDATE wishes SET state = ?, updated = ?, last_error = ? WHERE key = ?",
+                (WishState.REJECTED.value, time.time(), error, key),
+            )
+
+    def mark_failed(self, key: str, error: str):
+        """Schedule another delivery attempt of the wish `key` with exponential backoff."""
+        now = time.time()
+        with self._lock, self._connection as connection:
+            (attempts,) = connection.execute(
+                "SELECT attempts FROM wishes WHERE key = ?",
+                (key,),
+            ).fetchone()
+            attempts += 1
+            delay = min(2**attempts, self.max_retry_delay)
+            connection.execute(
+                "UPDATE wishes SET attempts = ?, next_attempt = ?, updated = ?,"
+                " last_error = ? WHERE key = ?",
+                (attempts, now + delay, now, error, key),
+            )
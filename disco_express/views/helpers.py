@@ -2,7 +2,17 @@ import os
 
 from PyQt6 import QtCore, QtGui, QtSvg
 
-from disco_express.config import APP_CONFIG_ROOT
+from disco_express.config import APP_CONFIG_ROOT, CONFIG, get_assets_path
+
+
+def build_stylesheet() -> str:
+    """Build the stylesheet of the app with the configured colors."""
+    with open(os.path.join(get_assets_path(), "styles", "stylesheet.qss")) as file:
+        style = file.read()
+
+    for color_name, color in CONFIG.style.colors.model_dump().items():
+        style = style.replace(f"%{color_name}%", color)
+    return style
 
 
 def load_colored_svg(
@@ -37,6 +37,8 @@ class CentralWidget(QtWidgets.QWidget):
 class MainView(QtWidgets.QMainWindow):
     """The main view holding all other views."""
 
+    metrics_requested = QtCore.pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setObjectName("MainView")
@@ -101,6 +103,15 @@ class MainView(QtWidgets.QMainWindow):
             logging.info("Closing app through keyboard shortcut")
             sys.exit(0)
 
+        # Define the secret shortcut Ctrl+Alt+Shift+M to dump the network metrics
+        if event.key() == QtCore.Qt.Key.Key_M and event.modifiers() == (
+            QtCore.Qt.KeyboardModifier.ControlModifier
+            | QtCore.Qt.KeyboardModifier.AltModifier
+            | QtCore.Qt.KeyboardModifier.ShiftModifier
+        ):
+            self.metrics_requested.emit()
+            return
+
         # Block common system shortcuts on Raspbian OS
         if (
             event.modifiers() == QtCore.Qt.KeyboardModifier.ControlModifier
@@ -3,6 +3,7 @@ from PyQt6 import QtCore, QtGui, QtWidgets
 from disco_express.config import CONFIG
 from disco_express.views.widgets import (
     Button,
+    GlowLabel,
     StatusWidget,
     SubHeaderLabel,
     build_accent1_glow_effect,
@@ -10,6 +11,9 @@ from disco_express.views.widgets import (
 
 from .view import View
 
+# the delay in ms after the last keystroke before suggestions are requested
+SUGGESTION_DELAY = 150
+
 
 class MusicEntryDescriptor(QtWidgets.QLabel):
     """Widget representing the descriptor text of the MusicEntry widget."""
@@ -31,14 +35,23 @@ class MusicEntry(QtWidgets.QWidget):
         example: the example text (placeholder)
         text: the actual text which should be set
         max_length: the limit of characters for the QLineEdit
+        suggestions: whether to request suggestions while typing, see
+            `suggestions_requested`
     """
 
+    # emitted with the entered text, once typing paused for SUGGESTION_DELAY ms
+    suggestions_requested = QtCore.pyqtSignal(str)
+    # emitted with the value of the suggestion picked from the popup
+    suggestion_selected = QtCore.pyqtSignal(object)
+
     def __init__(
         self,
         description: str,
         example: str | None = None,
         text: str | None = None,
         max_length: int = 32,
+        *,
+        suggestions: bool = False,
     ):
         super().__init__()
 
@@ -67,6 +80,31 @@ class MusicEntry(QtWidgets.QWidget):
         if example is not None:
             self.entry.setPlaceholderText(example)
 
+        if suggestions:
+            self._build_completer()
+
+    def _build_completer(self):
+        self._suggestion_timer = QtCore.QTimer(self)
+        self._suggestion_timer.setSingleShot(True)
+        self._suggestion_timer.setInterval(SUGGESTION_DELAY)
+        self._suggestion_timer.timeout.connect(
+            lambda: self.suggestions_requested.emit(self.entry.text()),
+        )
+        self.entry.textEdited.connect(lambda _: self._suggestion_timer.start())
+
+        self._suggestion_model = QtGui.QStandardItemModel(self)
+        # not set as completer of the QLineEdit, which would complete undebounced
+        self.completer = QtWidgets.QCompleter(self._suggestion_model, self)
+        self.completer.setCompletionMode(
+            QtWidgets.QCompleter.CompletionMode.UnfilteredPopupCompletion,
+        )
+        self.completer.setWidget(self.entry)
+        self.completer.activated[QtCore.QModelIndex].connect(
+            lambda index: self.suggestion_selected.emit(
+                index.data(QtCore.Qt.ItemDataRole.UserRole),
+            ),
+        )
+
     def text(self) -> str | None:
         """Retrieve the entered text."""
         return self.entry.text() if self.entry.text() else None
@@ -79,6 +117,25 @@ class MusicEntry(QtWidgets.QWidget):
         """Method to set the descriptor text to `text`."""
         self.descriptor.setText(text)
 
+    def show_suggestions(self, suggestions: list[tuple[str, object]]):
+        """Method to show the `suggestions` in a popup below the QLineEdit.
+
+        Args:
+            suggestions: the text shown and the value emitted when picked, of each
+                suggestion. The popup is hidden if there are none.
+        """
+        self._suggestion_model.clear()
+        for text, value in suggestions:
+            item = QtGui.QStandardItem(text)
+            item.setData(value, QtCore.Qt.ItemDataRole.UserRole)
+            item.setEditable(False)
+            self._suggestion_model.appendRow(item)
+
+        if suggestions and self.entry.hasFocus():
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+
 
 class MusicWishWidget(QtWidgets.QGroupBox):
     """Widget to display the input fields for a music wish."""
@@ -102,12 +159,14 @@ class MusicWishWidget(QtWidgets.QGroupBox):
         self.music_title = MusicEntry(
             CONFIG.selected_language.music_title,
             max_length=CONFIG.general.max_input_length,
+            suggestions=True,
         )
         layout.addWidget(self.music_title)
 
         self.artist = MusicEntry(
             CONFIG.selected_language.music_interpret,
             max_length=CONFIG.general.max_input_length,
+            suggestions=True,
         )
         layout.addWidget(self.artist)
 
@@ -144,6 +203,12 @@ class MusicWishView(View):
 
         layout.addStretch()
 
+        self.outbox_label = GlowLabel()
+        self.outbox_label.setObjectName("OutboxLabel")
+        self.outbox_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.outbox_label.setVisible(False)
+        layout.addWidget(self.outbox_label)
+
         footer_layout = QtWidgets.QHBoxLayout()
         layout.addLayout(footer_layout)
 
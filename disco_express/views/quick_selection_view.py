@@ -1,16 +1,13 @@
-import os.path
-
 from PyQt6 import QtCore, QtGui, QtWidgets
 
 from disco_express.config import (
-    APP_CONFIG_ROOT,
-    CLASSICS_SONGS,
     CONFIG,
-    CURRENT_CHARTS_SONGS,
     Song,
+    get_classics_songs,
+    get_current_charts_songs,
 )
 from disco_express.config.models import LanguageConfig
-from disco_express.models import ChartsManager
+from disco_express.models import ChartsManager, FuzzyIndex
 from disco_express.views.widgets import Button, build_accent1_glow_effect
 
 from .helpers import load_colored_svg
@@ -182,20 +179,34 @@ class SongsListWidget(QtWidgets.QWidget):
 
         main_lay.addWidget(scroll_area)
 
-        layout = QtWidgets.QGridLayout(w)
+        self._grid = QtWidgets.QGridLayout(w)
+        self._add_song_widgets()
+
+        scroll_area.setWidgetResizable(True)
+        self._scroll_area = scroll_area
+
+    def _add_song_widgets(self):
         for index, song in enumerate(self.charts, 1):
             song_widget = SongWidget(index, song, show_plays=self.show_plays)
             song_widget.clicked.connect(self._on_song_selected)
             song_amount = len(self._song_widgets)
 
-            layout.addWidget(
+            self._grid.addWidget(
                 song_widget,
                 song_amount // self.MAX_COLS,
                 song_amount % self.MAX_COLS,
             )
             self._song_widgets.append(song_widget)
 
-        scroll_area.setWidgetResizable(True)
+    def set_songs(self, chart_list: list[Song]):
+        """Method to display the songs of `chart_list` instead of the current ones."""
+        for song_widget in self._song_widgets:
+            self._grid.removeWidget(song_widget)
+            song_widget.deleteLater()
+        self._song_widgets = []
+        self.charts = chart_list
+        self._add_song_widgets()
+        self._scroll_area.verticalScrollBar().setValue(0)
 
     @QtCore.pyqtSlot()
     def _on_song_selected(self):
@@ -210,24 +221,33 @@ class QuickSelectionDialog(QtWidgets.QDialog):
 
     Args:
         language: The language in which the quick selection should be displayed.
+        charts_manager: The charts shown as most wanted songs.
+        fuzzy_index: The index searched with the search box.
     """
 
     MAX_COLS = 3
-
-    def __init__(self, language: LanguageConfig):
+    # the amount of most wanted songs shown
+    MAX_CHARTS = 100
+    # the amount of best matches shown when searching
+    MAX_RESULTS = 15
+
+    def __init__(
+        self,
+        language: LanguageConfig,
+        charts_manager: ChartsManager,
+        fuzzy_index: FuzzyIndex,
+    ):
         super().__init__()
 
         self.setObjectName("QuickSelectionDialog")
 
-        charts_path = os.path.join(APP_CONFIG_ROOT, CONFIG.general.charts_file)
-        self.charts_manager = ChartsManager(
-            charts_path,
-            charts_threshold=CONFIG.general.min_charts_threshold,
-        )
+        self.charts_manager = charts_manager
+        self.fuzzy_index = fuzzy_index
+        self._results = []
 
         self._selected_song = None
         self.language = language
-        self.songs = CLASSICS_SONGS
+        self.songs = get_classics_songs()
         self._song_widgets = []
 
         self.setFixedWidth(1200)
@@ -247,15 +267,31 @@ class QuickSelectionDialog(QtWidgets.QDialog):
 
     def load_charts(self) -> list[Song]:
         """Method to load the local charts list."""
-        return self.charts_manager.get_charts_list()
+        return self.charts_manager.get_charts_list(limit=self.MAX_CHARTS)
+
+    @QtCore.pyqtSlot(str)
+    def search(self, query: str):
+        """Method to show the best matches of `query` in the search tab."""
+        self.auto_close_timer.start()
+        self._results = self.fuzzy_index.search(query, limit=self.MAX_RESULTS)
+        self.search_widget.set_songs(self._results)
+        if query.strip():
+            self.tab.setCurrentWidget(self.search_widget)
 
     def _build_ui(self):
         layout = QtWidgets.QVBoxLayout(self)
 
+        self.search_entry = QtWidgets.QLineEdit()
+        self.search_entry.setPlaceholderText(self.language.quick_selection_search)
+        self.search_entry.setClearButtonEnabled(True)
+        self.search_entry.textChanged.connect(self.search)
+        self.search_entry.returnPressed.connect(self._on_search_confirmed)
+        layout.addWidget(self.search_entry)
+
         self.tab = QtWidgets.QTabWidget()
         layout.addWidget(self.tab)
 
-        self.classics_widget = SongsListWidget(CLASSICS_SONGS)
+        self.classics_widget = SongsListWidget(get_classics_songs())
         self.classics_widget.song_selected.connect(self._on_song_selected)
         self.tab.addTab(self.classics_widget, "[Classics]")
 
@@ -263,14 +299,25 @@ class QuickSelectionDialog(QtWidgets.QDialog):
         self.charts_widget.song_selected.connect(self._on_song_selected)
         self.tab.addTab(self.charts_widget, "[Most Wanted]")
 
-        self.charts_widget = SongsListWidget(CURRENT_CHARTS_SONGS)
+        self.charts_widget = SongsListWidget(get_current_charts_songs())
         self.charts_widget.song_selected.connect(self._on_song_selected)
         self.tab.addTab(self.charts_widget, "[Charts]")
 
+        self.search_widget = SongsListWidget([])
+        self.search_widget.song_selected.connect(self._on_song_selected)
+        self.tab.addTab(self.search_widget, "[Search]")
+
         close_button = Button("Close")
+        # Enter in the search box picks the best match instead of closing
+        close_button.setAutoDefault(False)
         close_button.clicked.connect(self.close)
         layout.addWidget(close_button)
 
+    @QtCore.pyqtSlot()
+    def _on_search_confirmed(self):
+        if self._results:
+            self._on_song_selected(self._results[0])
+
     @QtCore.pyqtSlot(Song)
     def _on_song_selected(self, song: Song):
         self._selected_song = song
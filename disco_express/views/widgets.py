@@ -226,6 +226,16 @@ class LanguageSwitch(QtWidgets.QWidget):
         self._language = sender.language
         self.language_switched.emit(self._language)
 
+    def update_languages(self, languages: list[LanguageConfig]):
+        """Replace the languages of the buttons by the ones with the same name."""
+        by_name = {language.language_name: language for language in languages}
+        for button in self.buttons:
+            button.language = by_name.get(
+                button.language.language_name,
+                button.language,
+            )
+        self._language = by_name.get(self._language.language_name, self._language)
+
     def get_selected_language(self) -> LanguageConfig:
         """Retrieve the selected language."""
         return self._language
@@ -317,12 +327,17 @@ class LoadingModal(QtWidgets.QDialog):
     - CONFIG.general.wish_sending_time
     - CONFIG.selected_language.loading_description
     - CONFIG.selected_language.loading_success
+    - CONFIG.selected_language.loading_queued
+
+    The success text is only shown once the wish is reported with `set_delivered`,
+    until then the wish is shown as queued.
     """
 
     def __init__(self):
         super().__init__()
 
         self.setObjectName("LoadingModal")
+        self.delivered = False
 
         self._loading_text_index = 0
 
@@ -371,11 +386,17 @@ class LoadingModal(QtWidgets.QDialog):
         self.loading_label.setObjectName("LoadingLabel")
         layout.addWidget(self.loading_label)
 
-        self.success_label = GlowLabel(CONFIG.selected_language.loading_success)
+        self.success_label = GlowLabel(CONFIG.selected_language.loading_queued)
         self.success_label.setObjectName("LoadingSuccessLabel")
         self.success_label.setVisible(False)
         layout.addWidget(self.success_label)
 
+    @QtCore.pyqtSlot()
+    def set_delivered(self):
+        """Method to report the wish as delivered to the server."""
+        self.delivered = True
+        self.success_label.setText(CONFIG.selected_language.loading_success)
+
     @QtCore.pyqtSlot()
     def _on_label_timer_timeout(self):
         self.loading_label.setText(
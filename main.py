@@ -7,8 +7,8 @@ from PyQt6 import QtGui, QtWidgets
 from disco_express.config import APP_CONFIG_ROOT, ASSETS, CONFIG
 from disco_express.controllers import MainController
 from disco_express.log import setup_basic_logger
+from disco_express.views.helpers import build_stylesheet
 
-STYLESHEET = os.path.join(ASSETS, "styles", "stylesheet.qss")
 FONTS = os.path.join(ASSETS, "fonts")
 
 log_file = os.path.join(
@@ -32,13 +32,7 @@ def main():  # noqa: D103
 
     load_fonts()
 
-    with open(STYLESHEET) as f:
-        style = f.read()
-
-    for color_name, color in CONFIG.style.colors.dict().items():
-        style = style.replace(f"%{color_name}%", color)
-
-    app.setStyleSheet(style)
+    app.setStyleSheet(build_stylesheet())
 
     CONFIG.selected_language = CONFIG.languages[0]
 
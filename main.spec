@@ -10,7 +10,8 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # only used for offline analyses of the charts
+    excludes=["pandas"],
     noarchive=False,
     optimize=0,
 )
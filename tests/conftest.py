@@ -0,0 +1,92 @@
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from http import HTTPStatus
+
+import pytest
+from PyQt6 import QtCore
+
+# the app keeps its files in the home directory, keep the tests away from them
+os.environ["HOME"] = tempfile.mkdtemp(prefix="disco_express_tests_")
+
+from disco_express.models import JukeBoxClient  # noqa: E402
+from tools.mock_server import MockHandler, MockServer, MockState  # noqa: E402
+
+
+class StandInHandler(MockHandler):
+    """Handler of the mock server recording the requests it answers.
+
+    The push channel can be switched off with `server.push_supported`.
+    """
+
+    server: "StandInServer"
+
+    def do_GET(self):  # noqa: N802, inherited
+        """Record the request and answer it like the mock server."""
+        self.server.requests.append((self.path, dict(self.headers)))
+        if self.path == "/events/" and not self.server.push_supported:
+            self._send_json({"detail": "Not Found"}, HTTPStatus.NOT_FOUND)
+            return
+        super().do_GET()
+
+
+class StandInServer(MockServer):
+    """Mock server answering with a StandInHandler."""
+
+    def __init__(self, address: tuple[str, int], state: MockState):
+        super().__init__(address, state)
+        self.RequestHandlerClass = StandInHandler
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.push_supported = True
+
+    def requests_to(self, path: str) -> list[dict[str, str]]:
+        """Retrieve the headers of all requests to `path`."""
+        return [
+            headers for request_path, headers in self.requests if request_path == path
+        ]
+
+
+@pytest.fixture(scope="session")
+def qapp() -> QtCore.QCoreApplication:
+    """The Qt application delivering queued signals."""
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture()
+def mock_server() -> Iterator[StandInServer]:
+    """A mock Disco Express Server on a free local port."""
+    server = StandInServer(("127.0.0.1", 0), MockState(documents=2, document_size=1024))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def client(mock_server: StandInServer) -> Iterator[JukeBoxClient]:
+    """A client of the `mock_server`."""
+    client = JukeBoxClient(
+        *mock_server.server_address[:2],
+        connect_timeout=1,
+        read_timeout=2,
+    )
+    yield client
+    client.close()
+
+
+def wait_until(
+    condition: Callable[[], bool],
+    timeout: float = 5,
+    app: QtCore.QCoreApplication | None = None,
+) -> bool:
+    """Wait up to `timeout` seconds for `condition`, delivering the Qt events of `app`."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        if app is not None:
+            app.processEvents()
+        time.sleep(0.01)
+    return True
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from disco_express.config.cache import load_cached
+
+
+def test_files_of_the_same_name_do_not_share_the_cache(tmp_path: Path):
+    cache_dir = tmp_path / "cache"
+    paths = []
+    for directory, content in (("classics", b"ABBA"), ("current", b"Queen")):
+        path = tmp_path / directory / "songs.csv"
+        path.parent.mkdir()
+        path.write_bytes(content)
+        paths.append(path)
+
+    values = [load_cached(str(path), bytes.decode, str(cache_dir)) for path in paths]
+    cached = [load_cached(str(path), bytes.decode, str(cache_dir)) for path in paths]
+
+    assert values == cached == ["ABBA", "Queen"]
+    assert len(list(cache_dir.iterdir())) == 2
@@ -0,0 +1,123 @@
+import threading
+from collections.abc import Iterator
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from disco_express.models import JukeBoxClient
+from disco_express.models.jukebox_client import ServerStatus, StatusSchema
+
+from .conftest import StandInServer
+
+
+class CountingParser:
+    """Parser of the status counting the bodies it parsed."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, body: bytes) -> ServerStatus:
+        """Parse the status in `body`."""
+        self.calls += 1
+        return StatusSchema.model_validate_json(body).status
+
+
+class LastModifiedHandler(BaseHTTPRequestHandler):
+    """Handler answering with a Last-Modified validator only."""
+
+    protocol_version = "HTTP/1.1"
+    last_modified = formatdate(0, usegmt=True)
+
+    def log_message(self, format: str, *args):  # noqa: A002, inherited
+        """Do not log the requests."""
+
+    def do_GET(self):  # noqa: N802, inherited
+        """Answer with the status, or 304 if the client's copy is current."""
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get("If-Modified-Since") == self.last_modified:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = b'{"status": "OK"}'
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Last-Modified", self.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def last_modified_server() -> Iterator[ThreadingHTTPServer]:
+    """A server validating the status by its modification time only."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LastModifiedHandler)
+    server.daemon_threads = True
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_etag_is_sent_and_304_returns_cached_value(
+    client: JukeBoxClient,
+    mock_server: StandInServer,
+):
+    parse = CountingParser()
+    assert client.conditional_get("/status/", parse) == ServerStatus.OK
+    assert client.conditional_get("/status/", parse) == ServerStatus.OK
+
+    first, second = mock_server.requests_to("/status/")
+    assert "If-None-Match" not in first
+    assert second["If-None-Match"].startswith('"')
+    # the 304 has no body, the value of the first response is returned
+    assert parse.calls == 1
+
+
+def test_validators_are_stored_per_uri(
+    client: JukeBoxClient,
+    mock_server: StandInServer,
+):
+    client.get_status()
+    client.get_banner_texts()
+    client.get_status()
+    client.get_banner_texts()
+
+    _, second_status = mock_server.requests_to("/status/")
+    first_banner, second_banner = mock_server.requests_to("/banner/")
+    # the validators of the status are not sent for the banner
+    assert "If-None-Match" not in first_banner
+    assert second_banner["If-None-Match"] != second_status["If-None-Match"]
+
+
+def test_changed_resource_is_parsed_again(
+    client: JukeBoxClient,
+    mock_server: StandInServer,
+):
+    parse = CountingParser()
+    client.conditional_get("/status/", parse)
+    mock_server.state.flip_status()
+
+    assert client.conditional_get("/status/", parse) == ServerStatus.UNAVAILABLE
+    assert parse.calls == 2
+
+
+def test_last_modified_is_sent_as_if_modified_since(
+    last_modified_server: ThreadingHTTPServer,
+):
+    client = JukeBoxClient(*last_modified_server.server_address[:2], read_timeout=2)
+    parse = CountingParser()
+    try:
+        assert client.conditional_get("/status/", parse) == ServerStatus.OK
+        assert client.conditional_get("/status/", parse) == ServerStatus.OK
+    finally:
+        client.close()
+
+    first, second = last_modified_server.requests
+    assert "If-Modified-Since" not in first
+    assert second["If-Modified-Since"] == LastModifiedHandler.last_modified
+    assert parse.calls == 1
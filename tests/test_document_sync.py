@@ -0,0 +1,95 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from disco_express.models import DocumentSync, JukeBoxClient, JukeBoxConnectionError
+from tools.mock_server import MockDocument
+
+from .conftest import StandInServer
+
+
+def test_orphaned_partial_downloads_are_removed(
+    mock_server: StandInServer,
+    client: JukeBoxClient,
+    tmp_path: Path,
+):
+    documents = mock_server.state.list_documents()
+    (tmp_path / ".removed.pdf.part").write_bytes(b"partial")
+    (tmp_path / ".removed.pdf.part.if-range").write_text('"etag"')
+    (tmp_path / f".{documents[0]}.part").write_bytes(b"")
+
+    assert DocumentSync(client, str(tmp_path)).sync()
+
+    assert sorted(os.listdir(tmp_path)) == [".manifest.json", *documents]
+
+
+class AppKilledError(Exception):
+    """Interrupts a download as if the app was closed."""
+
+
+def kill_app_after_first_chunk(doc: str, received: int, total: int | None):
+    raise AppKilledError
+
+
+def test_download_of_an_earlier_run_is_resumed(
+    mock_server: StandInServer,
+    client: JukeBoxClient,
+    tmp_path: Path,
+):
+    name = mock_server.state.list_documents()[0]
+    document = MockDocument(name, os.urandom(3 * JukeBoxClient.CHUNK_SIZE))
+    mock_server.state.documents[name] = document
+    earlier_client = JukeBoxClient(*mock_server.server_address[:2])
+    interrupted = DocumentSync(
+        earlier_client,
+        str(tmp_path),
+        progress=kill_app_after_first_chunk,
+    )
+    with pytest.raises(AppKilledError):
+        interrupted.sync()
+    earlier_client.close()
+    received = (tmp_path / f".{name}.part").stat().st_size
+    assert 0 < received < len(document.content)
+
+    DocumentSync(client, str(tmp_path)).sync()
+
+    resumed = mock_server.requests_to(f"/documents/{name}")[-1]
+    assert resumed["Range"] == f"bytes={received}-"
+    assert resumed["If-Range"] == document.etag
+    assert (tmp_path / name).read_bytes() == document.content
+    assert sorted(os.listdir(tmp_path)) == [
+        ".manifest.json",
+        *mock_server.state.list_documents(),
+    ]
+
+
+def test_changed_document_is_downloaded_again(
+    mock_server: StandInServer,
+    client: JukeBoxClient,
+    tmp_path: Path,
+):
+    sync = DocumentSync(client, str(tmp_path))
+    sync.sync()
+    name, unchanged = mock_server.state.list_documents()
+    mock_server.state.documents[name] = MockDocument(name, b"changed")
+
+    assert sync.sync()
+
+    assert (tmp_path / name).read_bytes() == b"changed"
+    revalidation = mock_server.requests_to(f"/documents/{unchanged}")[-1]
+    assert "If-None-Match" in revalidation
+
+
+def test_removed_document_is_not_retried(
+    mock_server: StandInServer,
+    client: JukeBoxClient,
+    tmp_path: Path,
+):
+    (tmp_path / ".removed.pdf.part").write_bytes(b"partial")
+    (tmp_path / ".removed.pdf.part.if-range").write_text('"etag"')
+
+    with pytest.raises(JukeBoxConnectionError):
+        client.get_document("removed.pdf", str(tmp_path))
+
+    assert len(mock_server.requests_to("/documents/removed.pdf")) == 1
@@ -0,0 +1,32 @@
+import threading
+
+from PyQt6 import QtCore
+
+from disco_express.controllers.executor import RequestExecutor
+from disco_express.controllers.poll_scheduler import PollScheduler
+
+from .conftest import wait_until
+
+
+def test_trigger_during_a_poll_polls_again(qapp: QtCore.QCoreApplication):
+    scheduler = PollScheduler(RequestExecutor(max_threads=1))
+    release = threading.Event()
+    polls = []
+
+    def poll() -> int:
+        polls.append(len(polls))
+        release.wait(5)
+        return len(polls)
+
+    results = []
+    scheduler.register("documents", 60, poll, on_result=results.append)
+    scheduler.set_paused("documents", True)
+    scheduler.trigger("documents")
+    assert wait_until(lambda: polls, app=qapp)
+
+    # a push event arriving while the sync is running
+    scheduler.trigger("documents")
+    release.set()
+
+    assert wait_until(lambda: len(results) == 2, app=qapp)
+    assert len(polls) == 2
@@ -0,0 +1,26 @@
+import pytest
+
+from disco_express.config.profanity import ProfanityMatcher
+
+MATCHER = ProfanityMatcher(["Bär", "Braß", "Bürger", "Göre", "fuck", "beat off"])
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Raising the Bar", "Brass Monkey", "Burger Queen", "Gore", "Dancing Queen"],
+)
+def test_ordinary_words_are_not_flagged(text: str):
+    assert text not in MATCHER
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Bär", "Braß", "bürger", "GÖRE", "f.u.c.k", "Fück", "fuuuck"],
+)
+def test_listed_words_are_flagged(text: str):
+    assert text in MATCHER
+
+
+def test_phrases_are_flagged():
+    assert MATCHER.find("Beat it off, beat off") == "beat off"
+    assert MATCHER.find("beatoff") == "beatoff"
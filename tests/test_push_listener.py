@@ -0,0 +1,169 @@
+from collections.abc import Iterator
+
+import pytest
+from PyQt6 import QtCore
+
+from disco_express.controllers.executor import RequestExecutor
+from disco_express.controllers.poll_scheduler import PollScheduler
+from disco_express.controllers.push_listener import PushListener
+from disco_express.models import JukeBoxClient, JukeBoxConnectionError
+from disco_express.models.jukebox_client import ServerStatus
+
+from .conftest import StandInServer, wait_until
+
+
+@pytest.fixture()
+def scheduler(qapp: QtCore.QCoreApplication) -> PollScheduler:
+    """A scheduler polling on its own executor."""
+    return PollScheduler(RequestExecutor(max_threads=2))
+
+
+def start_listener(
+    client: JukeBoxClient,
+    scheduler: PollScheduler,
+    connected: list[bool],
+    statuses: list[ServerStatus],
+) -> PushListener:
+    """Start a listener pausing the status poll while connected, like the app."""
+    listener = PushListener(client, read_timeout=2, max_backoff=1)
+    listener.status_received.connect(statuses.append)
+    listener.connected_changed.connect(connected.append)
+    listener.connected_changed.connect(
+        lambda paused: scheduler.set_paused("status", paused),
+    )
+    listener.start()
+    return listener
+
+
+def test_push_channel_delivers_events(
+    client: JukeBoxClient,
+    mock_server: StandInServer,
+):
+    response = client.open_events(read_timeout=2)
+    events = client.iter_events(response)
+    try:
+        assert next(events) == ("status", ServerStatus.OK)
+        assert next(events)[0] == "banner"
+        assert next(events) == ("documents", mock_server.state.list_documents())
+
+        mock_server.state.flip_status()
+        assert next(events) == ("status", ServerStatus.UNAVAILABLE)
+    finally:
+        response.close()
+
+
+def test_push_channel_keeps_out_of_the_pool(
+    mock_server: StandInServer,
+    caplog: pytest.LogCaptureFixture,
+):
+    client = JukeBoxClient(*mock_server.server_address[:2], pool_size=1)
+    response = client.open_events(read_timeout=2)
+    for _ in range(3):
+        client.get_status()
+    response.close()
+    client.close()
+
+    assert "Connection pool is full" not in caplog.text
+
+
+def test_polls_resume_when_the_channel_drops(
+    qapp: QtCore.QCoreApplication,
+    client: JukeBoxClient,
+    mock_server: StandInServer,
+    scheduler: PollScheduler,
+):
+    polls = []
+    scheduler.register("status", 60, client.get_status, on_result=polls.append)
+    connected, statuses = [], []
+    listener = start_listener(client, scheduler, connected, statuses)
+    try:
+        assert wait_until(lambda: connected == [True] and statuses, app=qapp)
+        assert wait_until(lambda: len(polls) == 1, app=qapp)
+
+        # drop the channel and refuse to open it again
+        mock_server.push_supported = False
+        mock_server.stopped.set()
+        mock_server.state.flip_status()
+
+        assert wait_until(lambda: connected == [True, False], app=qapp)
+        # the resumed poll catches up on the missed changes right away
+        assert wait_until(lambda: len(polls) == 2, app=qapp)
+        assert polls[-1] == ServerStatus.UNAVAILABLE
+        assert listener.wait(5000)
+    finally:
+        listener.stop()
+
+
+def test_unsupported_push_channel_falls_back_to_polling(
+    qapp: QtCore.QCoreApplication,
+    client: JukeBoxClient,
+    mock_server: StandInServer,
+    scheduler: PollScheduler,
+):
+    mock_server.push_supported = False
+    polls = []
+    scheduler.register("status", 0.2, client.get_status, on_result=polls.append)
+    connected, statuses = [], []
+    listener = start_listener(client, scheduler, connected, statuses)
+    try:
+        # the listener gives up for good and the status keeps being polled
+        assert listener.wait(5000)
+        assert wait_until(lambda: len(polls) >= 3, app=qapp)
+        assert connected == []
+        assert len(mock_server.requests_to("/events/")) == 1
+    finally:
+        listener.stop()
+
+
+def test_failing_channel_resumes_polls(
+    qapp: QtCore.QCoreApplication,
+    client: JukeBoxClient,
+    mock_server: StandInServer,
+    scheduler: PollScheduler,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    def broken_events(response: object) -> Iterator[tuple[str, object]]:
+        raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+    monkeypatch.setattr(client, "iter_events", broken_events)
+    polls = []
+    scheduler.register("status", 60, client.get_status, on_result=polls.append)
+    connected, statuses = [], []
+    listener = start_listener(client, scheduler, connected, statuses)
+    try:
+        # the listener survives the error and reopens the channel
+        assert wait_until(lambda: connected[:4] == [True, False, True, False], app=qapp)
+        assert listener.isRunning()
+        assert wait_until(lambda: len(polls) >= 2, app=qapp)
+    finally:
+        listener.stop()
+
+
+class FakeEventStream:
+    """Stand-in of a streamed response, which only serves `iter_content`."""
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.closed = False
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        """Iterate over the content in chunks of `chunk_size` bytes."""
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def close(self):
+        """Mark the stream as closed."""
+        self.closed = True
+
+
+def test_undecodable_event_is_skipped(client: JukeBoxClient):
+    stream = FakeEventStream(
+        b'event: banner\ndata: {"german": "\xff"}\n\n'
+        b'event: status\ndata: {"status": "OK"}\n\n',
+    )
+    events = client.iter_events(stream)
+
+    assert next(events) == ("status", ServerStatus.OK)
+    with pytest.raises(JukeBoxConnectionError):
+        next(events)
+    assert stream.closed
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from disco_express.config.models import Song
+from disco_express.models import (
+    ChartsManager,
+    FuzzyIndex,
+    PrefixIndex,
+    SongIndex,
+    song_key,
+)
+
+
+def test_removed_songs_leave_the_indexes(tmp_path: Path):
+    songs = SongIndex(
+        [
+            Song(title="Dancing Queen", artist="ABBA"),
+            Song(title="Dancing in the Dark", artist="Bruce Springsteen"),
+            Song(title="Waterloo", artist="ABBA"),
+        ],
+    )
+    prefixes = PrefixIndex(songs)
+    fuzzy = FuzzyIndex(songs)
+    charts = ChartsManager(str(tmp_path / "charts.csv"), index=songs)
+    charts.add_song(Song(title="Waterloo", artist="ABBA"))
+    prefixes.update()
+    fuzzy.update()
+
+    # the lists were reloaded with only "Dancing Queen", "Waterloo" was played
+    assert charts.retain_songs({song_key("Dancing Queen", "ABBA")}) == 1
+
+    assert [song.title for song in prefixes.titles("dancing")] == ["Dancing Queen"]
+    assert prefixes.artists("bruce") == []
+    assert [song.title for song in fuzzy.search("dancng")] == ["Dancing Queen"]
+    assert [song.title for song in prefixes.titles("water")] == ["Waterloo"]
+    assert charts.get_charts_list()[0].title == "Waterloo"
@@ -0,0 +1,61 @@
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+
+from disco_express.controllers.executor import RequestExecutor
+from disco_express.controllers.poll_scheduler import PollScheduler
+from disco_express.controllers.wish_sender import WishSender
+from disco_express.models import (
+    JukeBoxClient,
+    JukeBoxConnectionError,
+    MusicRequest,
+    WishOutbox,
+)
+
+from .conftest import StandInHandler, StandInServer
+
+
+class TruncatingHandler(StandInHandler):
+    """Handler dropping the connection in the middle of the body of a wish answer."""
+
+    def do_POST(self):  # noqa: N802, inherited
+        """Answer with a body shorter than announced and close the connection."""
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "100")
+        self.end_headers()
+        self.wfile.write(b'{"sta')
+        self.close_connection = True
+
+
+@pytest.fixture()
+def sender(client: JukeBoxClient, tmp_path: Path) -> WishSender:
+    """A sender delivering the wishes to the `mock_server`."""
+    outbox = WishOutbox(str(tmp_path / "outbox.sqlite3"))
+    return WishSender(outbox, client, PollScheduler(RequestExecutor(max_threads=1)))
+
+
+def test_interrupted_answer_keeps_the_wish(
+    mock_server: StandInServer,
+    sender: WishSender,
+):
+    mock_server.RequestHandlerClass = TruncatingHandler
+    sender.outbox.add(MusicRequest(title="Dancing Queen", interpret="ABBA"))
+
+    with pytest.raises(JukeBoxConnectionError):
+        sender.flush()
+
+    assert sender.outbox.count() == 1
+
+
+def test_delivered_wish_leaves_the_outbox(
+    mock_server: StandInServer,
+    sender: WishSender,
+):
+    key = sender.outbox.add(MusicRequest(title="Dancing Queen", interpret="ABBA"))
+
+    assert sender.flush() == 0
+
+    assert key in mock_server.state.wishes
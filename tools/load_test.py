@@ -0,0 +1,236 @@
+"""Load test driving simulated kiosks against a Disco Express Server.
+
+Every kiosk uses its own JukeBoxClient and behaves like the app: it polls the
+status, the banner and the documents, downloads changed documents and sends music
+wishes. At the end throughput and latency percentiles of each operation are reported.
+
+Usage:
+    python -m tools.load_test --kiosks 30 --duration 60 --mock
+"""
+
+import argparse
+import itertools
+import logging
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from disco_express.models import (
+    DocumentSync,
+    JukeBoxClient,
+    JukeBoxConnectionError,
+    MusicRequest,
+)
+
+from .mock_server import MockServer, MockState
+
+
+class LoadStats:
+    """Thread safe collection of the latencies and errors of all operations."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, seconds: float, error: str | None = None):
+        """Record one execution of `operation`."""
+        with self._lock:
+            self.latencies[operation].append(seconds * 1000)
+            if error is not None:
+                self.errors[operation] += 1
+
+    def report(self, duration: float) -> str:
+        """Build a table of throughput and latency percentiles per operation."""
+        lines = [
+            f"{'operation':<12}{'count':>8}{'errors':>8}{'req/s':>9}"
+            f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}",
+        ]
+        with self._lock:
+            operations = {
+                **self.latencies,
+                "total": list(itertools.chain(*self.latencies.values())),
+            }
+            errors = {**self.errors, "total": sum(self.errors.values())}
+        for operation, latencies in operations.items():
+            if len(latencies) > 1:
+                percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+                p50, p90, p99 = percentiles[49], percentiles[89], percentiles[98]
+            else:
+                p50 = p90 = p99 = latencies[0] if latencies else 0
+            lines.append(
+                f"{operation:<12}{len(latencies):>8}{errors.get(operation, 0):>8}"
+                f"{len(latencies) / duration:>9.1f}{p50:>9.1f}{p90:>9.1f}"
+                f"{p99:>9.1f}{max(latencies, default=0):>9.1f}",
+            )
+        return "\n".join(lines)
+
+
+class Kiosk(threading.Thread):
+    """A simulated kiosk calling the server like the app does.
+
+    Args:
+        client: the client of the kiosk
+        docs_dir: the directory the documents are synced to
+        intervals: the interval in seconds of each operation
+        stats: the stats the outcome of all operations is recorded in
+        stopped: ends the kiosk once set
+    """
+
+    def __init__(
+        self,
+        client: JukeBoxClient,
+        docs_dir: str,
+        intervals: dict[str, float],
+        stats: LoadStats,
+        stopped: threading.Event,
+    ):
+        super().__init__(daemon=True)
+        self.client = client
+        self.intervals = intervals
+        self.stats = stats
+        self.stopped = stopped
+        self.document_sync = DocumentSync(client, docs_dir)
+
+        self.operations = {
+            "status": client.get_status,
+            "banner": client.get_banner_texts,
+            "documents": self.document_sync.sync,
+            "music_wish": self.send_music_wish,
+        }
+
+    def send_music_wish(self):
+        """Send a random music wish."""
+        err = self.client.send_music_request(
+            MusicRequest(
+                title=f"Song {random.randint(1, 500)}",  # noqa: S311
+                interpret=f"Artist {random.randint(1, 100)}",  # noqa: S311
+            ),
+            idempotency_key=str(uuid.uuid4()),
+        )
+        if err is not None:
+            raise JukeBoxConnectionError(err.error)
+
+    def run(self):
+        """Run the operations in their intervals until stopped."""
+        now = time.monotonic()
+        # spread the first calls, so the kiosks do not run in lockstep
+        next_due = {
+            name: now + random.uniform(0, interval)  # noqa: S311
+            for name, interval in self.intervals.items()
+            if interval > 0
+        }
+        while next_due:
+            name = min(next_due, key=next_due.get)
+            if self.stopped.wait(max(0.0, next_due[name] - time.monotonic())):
+                return
+
+            started = time.perf_counter()
+            try:
+                self.operations[name]()
+            except (JukeBoxConnectionError, OSError) as exc:
+                self.stats.record(
+                    name,
+                    time.perf_counter() - started,
+                    type(exc).__name__,
+                )
+            else:
+                self.stats.record(name, time.perf_counter() - started)
+            next_due[name] = time.monotonic() + self._interval(name)
+
+    def _interval(self, name: str) -> float:
+        if name == "music_wish":
+            # wishes arrive randomly instead of periodically
+            return random.expovariate(1 / self.intervals[name])
+        return self.intervals[name]
+
+
+def main():  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--kiosks", type=int, default=30)
+    parser.add_argument("--duration", type=float, default=60, help="in seconds")
+    parser.add_argument("--status-interval", type=float, default=5)
+    parser.add_argument("--banner-interval", type=float, default=10)
+    parser.add_argument("--documents-interval", type=float, default=10)
+    parser.add_argument(
+        "--wish-interval",
+        type=float,
+        default=30,
+        help="mean seconds between two wishes of a kiosk, 0 to send none",
+    )
+    parser.add_argument("--pool-size", type=int, default=4)
+    mock = parser.add_argument_group("mock server")
+    mock.add_argument(
+        "--mock",
+        action="store_true",
+        help="run the test against an in-process mock server",
+    )
+    mock.add_argument("--latency", type=float, default=0, help="mean latency in ms")
+    mock.add_argument("--error-rate", type=float, default=0)
+    mock.add_argument("--status-flip", type=float, default=0, help="in seconds")
+    mock.add_argument("--document-churn", type=float, default=0, help="in seconds")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    host, port = args.host, args.port
+    if args.mock:
+        server = MockServer(
+            (host, 0),
+            MockState(),
+            latency=args.latency,
+            error_rate=args.error_rate,
+        )
+        server.run_periodically(args.status_flip, server.state.flip_status)
+        server.run_periodically(args.document_churn, server.state.churn_documents)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+
+    intervals = {
+        "status": args.status_interval,
+        "banner": args.banner_interval,
+        "documents": args.documents_interval,
+        "music_wish": args.wish_interval,
+    }
+    stats = LoadStats()
+    stopped = threading.Event()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        kiosks = [
+            Kiosk(
+                JukeBoxClient(host, port, pool_size=args.pool_size),
+                tempfile.mkdtemp(dir=tmp_dir),
+                intervals,
+                stats,
+                stopped,
+            )
+            for _ in range(args.kiosks)
+        ]
+        started = time.monotonic()
+        for kiosk in kiosks:
+            kiosk.start()
+        stopped.wait(args.duration)
+        stopped.set()
+        for kiosk in kiosks:
+            kiosk.join()
+        duration = time.monotonic() - started
+
+    received = sum(
+        endpoint["bytes_received"]
+        for kiosk in kiosks
+        for endpoint in kiosk.client.metrics.snapshot()["endpoints"].values()
+    )
+    sys.stdout.write(
+        f"{args.kiosks} kiosks, {duration:.1f} s, "
+        f"{received / duration / 1024:.1f} KiB/s received\n",
+    )
+    sys.stdout.write(stats.report(duration) + "\n")
+
+
+if __name__ == "__main__":
+    main()
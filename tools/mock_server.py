@@ -0,0 +1,379 @@
+"""Mock of the Disco Express Server for local development and load tests.
+
+Serves /status/, /banner/, /documents/, /documents/{name}, /music_wish/ and the
+push channel /events/ like the real server, including ETags, Range requests and
+idempotency keys. Latency, errors, status flips and document churn can be simulated.
+
+Usage:
+    python -m tools.mock_server --port 8080 --latency 50 --error-rate 0.05
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+STATUS_CYCLE = ("OK", "UNAVAILABLE")
+KEEP_ALIVE_INTERVAL = 15  # in seconds
+
+
+class MockDocument:
+    """A document served by the mock server.
+
+    Args:
+        name: the name of the document
+        content: the content of the document
+    """
+
+    def __init__(self, name: str, content: bytes):
+        self.name = name
+        self.content = content
+        self.etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+
+
+class MockState:
+    """The thread safe state of the mock server.
+
+    Args:
+        documents: the amount of documents served initially
+        document_size: the size of each document in bytes
+    """
+
+    def __init__(self, documents: int = 3, document_size: int = 256 * 1024):
+        self.document_size = document_size
+        self.status = "OK"
+        self.banner = {
+            "german": "Willkommen bei Disco Express",
+            "english": "Welcome to Disco Express",
+        }
+        self.documents = {}
+        self.wishes = {}
+
+        self._document_ids = iter(range(1, 2**31))
+        self._subscribers: list[queue.Queue] = []
+        self._lock = threading.Lock()
+
+        for _ in range(documents):
+            self._add_document()
+
+    def subscribe(self) -> queue.Queue:
+        """Register a push channel, which receives all following events."""
+        events = queue.Queue()
+        with self._lock:
+            self._subscribers.append(events)
+        return events
+
+    def unsubscribe(self, events: queue.Queue):
+        """Remove a push channel registered with `subscribe`."""
+        with self._lock:
+            self._subscribers.remove(events)
+
+    def list_documents(self) -> list[str]:
+        """Retrieve the sorted names of all documents."""
+        with self._lock:
+            return sorted(self.documents)
+
+    def get_document(self, name: str) -> MockDocument | None:
+        """Retrieve the document `name`, None if it does not exist."""
+        with self._lock:
+            return self.documents.get(name)
+
+    def current_events(self) -> list[tuple[str, object]]:
+        """Retrieve the events describing the current state."""
+        with self._lock:
+            return [
+                ("status", {"status": self.status}),
+                ("banner", self.banner),
+                ("documents", sorted(self.documents)),
+            ]
+
+    def flip_status(self):
+        """Switch to the next status of STATUS_CYCLE."""
+        with self._lock:
+            index = (
+                STATUS_CYCLE.index(self.status) if self.status in STATUS_CYCLE else -1
+            )
+            self.status = STATUS_CYCLE[(index + 1) % len(STATUS_CYCLE)]
+            self._publish("status", {"status": self.status})
+        logging.info("Status changed to %s", self.status)
+
+    def churn_documents(self):
+        """Add, change or remove a random document."""
+        with self._lock:
+            action = random.choice(("add", "change", "remove"))  # noqa: S311
+            if action == "add" or not self.documents:
+                name = self._add_document()
+            elif action == "change":
+                name = random.choice(sorted(self.documents))  # noqa: S311
+                self.documents[name] = MockDocument(
+                    name,
+                    os.urandom(self.document_size),
+                )
+            else:
+                name = random.choice(sorted(self.documents))  # noqa: S311
+                del self.documents[name]
+            self._publish("documents", sorted(self.documents))
+        logging.info("Document '%s': %s", name, action)
+
+    def add_wish(self, key: str | None, wish: dict) -> bool:
+        """Store a music `wish`, returns False if `key` was delivered before."""
+        with self._lock:
+            key = key or f"anonymous-{len(self.wishes)}"
+            if key in self.wishes:
+                return False
+            self.wishes[key] = wish
+            return True
+
+    def _add_document(self) -> str:
+        name = f"document_{next(self._document_ids)}.pdf"
+        self.documents[name] = MockDocument(name, os.urandom(self.document_size))
+        return name
+
+    def _publish(self, event: str, data: object):
+        for events in self._subscribers:
+            events.put((event, data))
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Request handler answering like the Disco Express Server."""
+
+    protocol_version = "HTTP/1.1"
+    server: "MockServer"
+
+    def log_message(self, format: str, *args):  # noqa: A002, inherited
+        """Log requests on debug level only."""
+        logging.debug(format, *args)
+
+    def do_GET(self):  # noqa: N802, inherited
+        """Answer a GET request."""
+        if not self._simulate():
+            return
+
+        state = self.server.state
+        if self.path == "/events/":
+            self._send_events()
+        elif self.path == "/status/":
+            self._send_json({"status": state.status})
+        elif self.path == "/banner/":
+            self._send_json(state.banner)
+        elif self.path == "/documents/":
+            self._send_json(state.list_documents())
+        elif match := re.fullmatch(r"/documents/(.+)", self.path):
+            self._send_document(unquote(match.group(1)))
+        else:
+            self._send_json({"detail": "Not Found"}, HTTPStatus.NOT_FOUND)
+
+    def do_POST(self):  # noqa: N802, inherited
+        """Answer a POST request."""
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        if not self._simulate():
+            return
+
+        if self.path != "/music_wish/":
+            self._send_json({"detail": "Not Found"}, HTTPStatus.NOT_FOUND)
+            return
+        try:
+            wish = json.loads(body)
+        except ValueError:
+            self._send_json({"error": "Invalid JSON"}, HTTPStatus.BAD_REQUEST)
+            return
+
+        if self.server.state.add_wish(self.headers.get("Idempotency-Key"), wish):
+            logging.info("Music wish: %s", wish)
+        self._send_json({})
+
+    def _simulate(self) -> bool:
+        if self.server.latency > 0:
+            time.sleep(random.expovariate(1000 / self.server.latency))
+        failing = random.random() < self.server.error_rate  # noqa: S311
+        if self.path == "/events/" or not failing:
+            return True
+
+        self._send_json({"error": "Simulated error"}, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return False
+
+    def _send_json(self, data: object, status: HTTPStatus = HTTPStatus.OK):
+        body = json.dumps(data).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if status == HTTPStatus.OK and self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == HTTPStatus.OK:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_document(self, name: str):
+        document = self.server.state.get_document(name)
+        if document is None:
+            self._send_json({"detail": "Not Found"}, HTTPStatus.NOT_FOUND)
+            return
+        if self.headers.get("If-None-Match") == document.etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", document.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        content = document.content
+        start = 0
+        range_match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        if range_match and (if_range is None or if_range == document.etag):
+            start = int(range_match.group(1))
+            if start >= len(content):
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{len(content)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header(
+                "Content-Range",
+                f"bytes {start}-{len(content) - 1}/{len(content)}",
+            )
+        else:
+            self.send_response(HTTPStatus.OK)
+
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(content) - start))
+        self.send_header("ETag", document.etag)
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        self.wfile.write(content[start:])
+
+    def _send_events(self):
+        state = self.server.state
+        events = state.subscribe()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for event, data in state.current_events():
+                self._write_event(event, data)
+            while not self.server.stopped.is_set():
+                try:
+                    event, data = events.get(timeout=KEEP_ALIVE_INTERVAL)
+                except queue.Empty:
+                    self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+                    continue
+                self._write_event(event, data)
+        except OSError:
+            logging.debug("Push channel closed by the client")
+        finally:
+            state.unsubscribe(events)
+
+    def _write_event(self, event: str, data: object):
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+        self.wfile.flush()
+
+
+class MockServer(ThreadingHTTPServer):
+    """Threaded HTTP server simulating the Disco Express Server.
+
+    Args:
+        address: the host and port to listen on
+        state: the state served
+        latency: the mean latency in ms added to every request
+        error_rate: the share of requests answered with an internal server error
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        state: MockState,
+        latency: float = 0,
+        error_rate: float = 0,
+    ):
+        super().__init__(address, MockHandler)
+        self.state = state
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stopped = threading.Event()
+
+    def run_periodically(self, interval: float, func: Callable[[], None]):
+        """Call `func` every `interval` seconds in a background thread until shutdown."""
+        if interval <= 0:
+            return
+
+        def run():
+            while not self.stopped.wait(interval):
+                func()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def shutdown(self):
+        """Stop serving and end all push channels."""
+        self.stopped.set()
+        super().shutdown()
+
+
+def main():  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0, help="mean latency in ms")
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0,
+        help="share of requests failing with status 500",
+    )
+    parser.add_argument(
+        "--status-flip",
+        type=float,
+        default=0,
+        help="interval in seconds to switch between OK and UNAVAILABLE",
+    )
+    parser.add_argument(
+        "--document-churn",
+        type=float,
+        default=0,
+        help="interval in seconds to add, change or remove a document",
+    )
+    parser.add_argument("--documents", type=int, default=3)
+    parser.add_argument("--document-size", type=int, default=256 * 1024)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    server = MockServer(
+        (args.host, args.port),
+        MockState(args.documents, args.document_size),
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    server.run_periodically(args.status_flip, server.state.flip_status)
+    server.run_periodically(args.document_churn, server.state.churn_documents)
+    logging.info("Mock server listening on %s:%s", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Shutting down")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Measure the cold start time and the idle memory of Disco Express.
+
+Every run starts the app in a fresh interpreter until its first frame is drawn,
+lets it idle and reports the time taken and the resident memory. The medians of
+all runs are printed, the first run is a warm up for the file system cache.
+
+Usage:
+    python -m tools.startup_profile --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# executed in a fresh interpreter
+CHILD = """
+import time
+started = time.perf_counter()
+import json, os, sys
+{preload}
+import main
+imported = time.perf_counter()
+
+from PyQt6 import QtCore, QtWidgets
+from disco_express.config import CONFIG
+from disco_express.controllers import MainController
+
+app = QtWidgets.QApplication(sys.argv)
+CONFIG.selected_language = CONFIG.languages[0]
+ctrl = MainController()
+ctrl.view.show()
+
+
+def rss():
+    with open("/proc/self/status") as file:
+        for line in file:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+def first_frame():
+    result["first_frame_s"] = time.perf_counter() - started
+    result["first_frame_rss_mib"] = rss()
+    QtCore.QTimer.singleShot({idle_ms}, idle)
+
+
+def idle():
+    result["idle_rss_mib"] = rss()
+    result["pandas_loaded"] = "pandas" in sys.modules
+    sys.stdout.write(json.dumps(result) + "\\n")
+    sys.stdout.flush()
+    os._exit(0)
+
+
+result = {{"import_s": imported - started}}
+QtCore.QTimer.singleShot(0, first_frame)
+app.exec()
+"""
+
+
+def run_once(preload: str, idle: float) -> dict:
+    """Start the app once in a fresh interpreter and retrieve its measurements."""
+    code = CHILD.format(
+        preload=preload,
+        idle_ms=int(idle * 1000),
+    )
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", code],  # noqa: S603, runs this interpreter
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+    # include the start of the interpreter, but not the idle time
+    result["process_s"] = time.perf_counter() - started - idle
+    return result
+
+
+def main():  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--idle", type=float, default=2, help="in seconds")
+    parser.add_argument(
+        "--import-pandas",
+        action="store_true",
+        help="import pandas before the app, to compare with it on the startup path",
+    )
+    args = parser.parse_args()
+
+    preload = "import pandas" if args.import_pandas else ""
+    results = [run_once(preload, args.idle) for _ in range(args.runs + 1)][1:]
+    for key in ("process_s", "import_s", "first_frame_s"):
+        median = statistics.median(result[key] for result in results)
+        sys.stdout.write(f"{key:<22}{median * 1000:>10.0f} ms\n")
+    for key in ("first_frame_rss_mib", "idle_rss_mib"):
+        median = statistics.median(result[key] for result in results)
+        sys.stdout.write(f"{key:<22}{median:>10.1f} MiB\n")
+    sys.stdout.write(f"{'pandas_loaded':<22}{results[0]['pandas_loaded']!s:>10}\n")
+
+
+if __name__ == "__main__":
+    main()